@@ -0,0 +1,112 @@
+# coding: utf-8
+"""
+Compares the default requests transport with the HTTP/2 transport under concurrent load.
+
+For each transport, sends `--requests` public `get_orderbook` calls from `--concurrency` threads and reports the number of TCP connections opened and the latency distribution.
+
+    $ pip install 'httpx[http2]'
+    $ python benchmarks/transport.py --concurrency 200 --requests 2000 --symbol ETHBTC
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import socket
+import threading
+import time
+
+import requests
+
+from hitbtcapi.client import Client
+from hitbtcapi.transport import HTTP2Transport
+from hitbtcapi.transport import RequestsTransport
+
+
+class ConnectionCounter(object):
+    """
+    Counts TCP connections opened through `socket.socket.connect` while active.
+    """
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+        self._connect = socket.socket.connect
+
+    def __enter__(self):
+        counter = self
+        original = self._connect
+        def connect(sock,address):
+            with counter._lock:
+                counter.count += 1
+            return original(sock,address)
+        socket.socket.connect = connect
+        return self
+
+    def __exit__(self,*exc_info):
+        socket.socket.connect = self._connect
+
+
+def percentile(samples,percent):
+    return samples[min(int(len(samples) * percent / 100.0),len(samples) - 1)]
+
+
+def run(name,transport,args):
+    client = Client('benchmark','benchmark',base_api_uri=args.base_api_uri,transport=transport)
+    latencies = []
+    failures = []
+    remaining = [args.requests]
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not remaining[0]:
+                    return
+                remaining[0] -= 1
+            start = time.time()
+            try:
+                client.get_orderbook(args.symbol,limit=args.limit)
+            except Exception as e:
+                failures.append(e)
+                continue
+            elapsed = time.time() - start
+            with lock:
+                latencies.append(elapsed)
+
+    with ConnectionCounter() as connections:
+        start = time.time()
+        threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.time() - start
+    transport.close()
+
+    latencies.sort()
+    print('%-9s connections=%-4d ok=%-5d failed=%-4d req/s=%-7.1f p50=%.1fms p99=%.1fms max=%.1fms' % (
+        name,connections.count,len(latencies),len(failures),len(latencies) / duration,
+        percentile(latencies,50) * 1000 if latencies else 0,
+        percentile(latencies,99) * 1000 if latencies else 0,
+        latencies[-1] * 1000 if latencies else 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--base-api-uri',default=Client.BASE_API_URI)
+    parser.add_argument('--symbol',default='ETHBTC')
+    parser.add_argument('--limit',type=int,default=10)
+    parser.add_argument('--concurrency',type=int,default=100)
+    parser.add_argument('--requests',type=int,default=1000)
+    args = parser.parse_args()
+
+    session = requests.session()
+    # let the pool keep a connection per thread, as a tuned requests setup would
+    session.mount('https://',requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency))
+    run('requests',RequestsTransport(session),args)
+    run('http2',HTTP2Transport(),args)
+
+
+if __name__ == '__main__':
+    main()
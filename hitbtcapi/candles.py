@@ -0,0 +1,206 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+from decimal import Decimal
+
+import six
+
+from .utils import parse_timestamp
+from .utils import format_timestamp
+
+
+# candle periods supported by the HitBTC API, in seconds
+PERIODS = {
+    'M1': 60,
+    'M3': 3 * 60,
+    'M5': 5 * 60,
+    'M15': 15 * 60,
+    'M30': 30 * 60,
+    'H1': 60 * 60,
+    'H4': 4 * 60 * 60,
+    'D1': 24 * 60 * 60,
+    'D7': 7 * 24 * 60 * 60,
+}
+
+
+def period_seconds(period):
+    """
+    Returns the length of a candle period in seconds. Accepts either a HitBTC period name (e.g. 'M15') or a number of seconds.
+    """
+    if isinstance(period,six.string_types):
+        if period not in PERIODS:
+            raise ValueError("Unsupported candle period '%s'" % period)
+        return PERIODS[period]
+    if int(period) <= 0:
+        raise ValueError('Candle period must be a positive number of seconds')
+    return int(period)
+
+
+class _Bar(object):
+    """
+    Internal mutable OHLCV bar. Prices and volumes are kept as Decimals so that aggregation is exact.
+    """
+    __slots__ = ('start','open','close','min','max','volume','volume_quote')
+
+    def __init__(self,start,open_,close,min_,max_,volume,volume_quote):
+        self.start = start
+        self.open = open_
+        self.close = close
+        self.min = min_
+        self.max = max_
+        self.volume = volume
+        self.volume_quote = volume_quote
+
+    def update(self,open_,close,min_,max_,volume,volume_quote):
+        if self.volume == 0 and volume:
+            # a gap-filling bar receives its first real data
+            self.open = open_
+            self.min = min_
+            self.max = max_
+        else:
+            self.min = min(self.min,min_)
+            self.max = max(self.max,max_)
+        self.close = close
+        self.volume += volume
+        self.volume_quote += volume_quote
+
+    def as_dict(self):
+        return {
+            'timestamp': format_timestamp(self.start),
+            'open': str(self.open),
+            'close': str(self.close),
+            'min': str(self.min),
+            'max': str(self.max),
+            'volume': str(self.volume),
+            'volumeQuote': str(self.volume_quote),
+        }
+
+
+class _Series(object):
+    """
+    Internal ring buffer of contiguous bars for a single interval.
+    """
+    def __init__(self,interval,maxlen):
+        self.interval = interval
+        self.bars = collections.deque(maxlen=maxlen)
+        # trades and candles starting before this time are already accounted for
+        self.cutoff = None
+
+    def add(self,timestamp,open_,close,min_,max_,volume,volume_quote):
+        start = timestamp - timestamp % self.interval
+        bars = self.bars
+        if not bars:
+            bars.append(_Bar(start,open_,close,min_,max_,volume,volume_quote))
+            return
+        last = bars[-1]
+        if start == last.start:
+            last.update(open_,close,min_,max_,volume,volume_quote)
+        elif start > last.start:
+            # fill empty intervals with flat bars so the series has no gaps
+            gap = int((start - last.start) // self.interval) - 1
+            for i in six.moves.range(max(gap - bars.maxlen,0),gap):
+                flat = last.close
+                bars.append(_Bar(last.start + (i + 1) * self.interval,flat,flat,flat,flat,Decimal(0),Decimal(0)))
+            bars.append(_Bar(start,open_,close,min_,max_,volume,volume_quote))
+        else:
+            # late data for a bar which is still held in the buffer
+            index = len(bars) - 1 - int((last.start - start) // self.interval)
+            if index >= 0:
+                bar = bars[index]
+                if bar.volume:
+                    bar.min = min(bar.min,min_)
+                    bar.max = max(bar.max,max_)
+                else:
+                    bar.open,bar.close,bar.min,bar.max = open_,close,min_,max_
+                bar.volume += volume
+                bar.volume_quote += volume_quote
+
+
+class CandleAggregator(object):
+    """
+    Incrementally aggregates trades into OHLCV candles for any number of intervals at once.
+
+    Intervals can be HitBTC period names (e.g. 'M1', 'H1') or arbitrary lengths in seconds. Each interval keeps at most `maxlen` bars in a ring buffer, and every trade is applied in constant time per interval. Candles are returned in the same format as `Client.get_candles`.
+
+    Usage:
+        aggregator = CandleAggregator(['M1',90,'H1'])
+        aggregator.seed(client.get_candles('ETHBTC',period='M1')[:-1],'M1')
+        aggregator.add_trades(client.get_trades('ETHBTC',sort='ASC',**params))
+        aggregator.candles(90)
+    """
+    def __init__(self,intervals,maxlen=1000):
+        if not intervals:
+            raise ValueError('At least one interval is required')
+        self._series = collections.OrderedDict()
+        for interval in intervals:
+            self._series[interval] = _Series(period_seconds(interval),maxlen)
+        self.last_trade_id = None
+
+    @property
+    def intervals(self):
+        return list(self._series)
+
+    def add_trade(self,trade):
+        """
+        Applies a single trade (as returned by `Client.get_trades` or `Client.get_trade_history`) to all intervals. Trades already seen (by trade id) are ignored.
+        """
+        trade_id = trade.get('id')
+        if trade_id is not None:
+            if self.last_trade_id is not None and trade_id <= self.last_trade_id:
+                return
+            self.last_trade_id = trade_id
+        timestamp = parse_timestamp(trade['timestamp'])
+        price = Decimal(trade['price'])
+        quantity = Decimal(trade['quantity'])
+        notional = price * quantity
+        for series in six.itervalues(self._series):
+            if series.cutoff is not None and timestamp < series.cutoff:
+                continue
+            series.add(timestamp,price,price,price,price,quantity,notional)
+
+    def add_trades(self,trades):
+        """
+        Applies a page of trades. Pages are sorted in ascending order first, so the default (descending) output of `Client.get_trades` can be passed directly.
+        """
+        for trade in sorted(trades,key=lambda t: (t['timestamp'],t.get('id'))):
+            self.add_trade(trade)
+
+    def seed(self,candles,period):
+        """
+        Seeds all intervals from historical candles (as returned by `Client.get_candles`) of the given period. Candles are merged into every interval which is a multiple of the period; trades which fall before the end of the last seeded candle are then ignored for that interval.
+
+        The most recent candle returned by the API is usually still open, so it should normally be dropped before seeding and its trades fed in instead.
+        """
+        seconds = period_seconds(period)
+        candles = sorted(candles,key=lambda c: c['timestamp'])
+        if not candles:
+            return
+        for series in six.itervalues(self._series):
+            if series.interval % seconds:
+                continue
+            for candle in candles:
+                series.add(parse_timestamp(candle['timestamp']),
+                           Decimal(candle['open']),Decimal(candle['close']),
+                           Decimal(candle['min']),Decimal(candle['max']),
+                           Decimal(candle['volume']),Decimal(candle['volumeQuote']))
+            series.cutoff = parse_timestamp(candles[-1]['timestamp']) + seconds
+
+    def candles(self,interval,limit=None):
+        """
+        Returns the bars held for an interval, oldest first, in the format of `Client.get_candles`.
+        """
+        bars = self._series[interval].bars
+        if limit is not None:
+            bars = list(bars)[-limit:] if limit else []
+        return [bar.as_dict() for bar in bars]
+
+    def current(self,interval):
+        """
+        Returns the most recent (possibly still open) bar for an interval, or None if no data has been seen yet.
+        """
+        bars = self._series[interval].bars
+        return bars[-1].as_dict() if bars else None
@@ -4,11 +4,15 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import functools
 import json
 import requests
 import warnings
 
 from .utils import check_uri_security
+from .transport import RequestsTransport
+from .scheduler import classify
+from .failover import EndpointPool
 from .compat import quote
 from .compat import imap
 from .errors import api_response_error,ParameterRequiredError
@@ -27,7 +31,7 @@ class Client(object):
 
     BASE_API_URI = 'https://api.hitbtc.com/api/2/' #latest v2
 
-    def __init__(self,key,secret,base_api_uri=None):
+    def __init__(self,key,secret,base_api_uri=None,hedging=None,transport=None,symbol_table=None,scheduler=None):
         if not key:
             raise ValueError("Missing API 'key'")
         if not secret:
@@ -35,9 +39,25 @@ class Client(object):
         self._key = key
         self._secret = secret
         # Allow passing in a different API base and warn if it is insecure.
-        self.BASE_API_URI = check_uri_security(base_api_uri or self.BASE_API_URI)
+        # Several bases (or an EndpointPool) enable failover between them.
+        if isinstance(base_api_uri,(list,tuple)):
+            base_api_uri = EndpointPool(base_api_uri)
+        if isinstance(base_api_uri,EndpointPool):
+            self.endpoints = base_api_uri
+            self.BASE_API_URI = self.endpoints.breakers[0].uri
+        else:
+            self.endpoints = None
+            self.BASE_API_URI = check_uri_security(base_api_uri or self.BASE_API_URI)
+        # Optional HedgingPolicy for idempotent GET requests.
+        self._hedging = hedging
+        # Optional SymbolTable for validating orders before they are sent.
+        self.symbol_table = symbol_table
+        # Optional RequestScheduler ordering requests by priority class.
+        self.scheduler = scheduler
         # Set up a requests session for interacting with the API.
         self._build_session()
+        # Allow replacing the requests session with a different transport.
+        self._transport = transport if transport is not None else RequestsTransport(self._session)
 
     def _build_session(self):
         """
@@ -45,19 +65,39 @@ class Client(object):
         """
         self._session = requests.session()
         self._session.auth = (self._key, self._secret)
+        if self.scheduler is not None:
+            # keep a pooled connection for every request the scheduler lets through
+            self._session.mount('https://',requests.adapters.HTTPAdapter(pool_maxsize=self.scheduler.max_concurrency))
+
+    def _create_api_path(self,*dirs):
+        """
+        Internal helper for creating endpoint paths relative to the API base.
+        """
+        return '/'.join(imap(quote,dirs))
 
     def _create_api_uri(self,*dirs):
         """
         Internal helper for creating fully qualified endpoint URIs.
         """
-        return self.BASE_API_URI +'/'.join(imap(quote,dirs))
+        return self.BASE_API_URI + self._create_api_path(*dirs)
 
     def _request(self,method,*dirs,**kwargs):
         """
         Internal helper for creating HTTP requests to the HitBTC API. Returns the HTTP response.
+        GET requests are hedged if a hedging policy is set, against the latency of their endpoint (the first two path parts, without ids); requests which modify state never are.
         """
-        uri = self._create_api_uri(*dirs)
-        return getattr(self._session,method)(uri,**kwargs)
+        if self.endpoints is None:
+            uri = self._create_api_uri(*dirs)
+            send = lambda: self._transport.request(method,uri,auth=self._session.auth,**kwargs)
+        else:
+            path = self._create_api_path(*dirs)
+            send = functools.partial(self.endpoints.call,
+                                     lambda base: self._transport.request(method,base + path,auth=self._session.auth,**kwargs))
+        if self.scheduler is not None:
+            send = functools.partial(self.scheduler.run,classify(method,dirs),send)
+        if self._hedging is not None and method == 'get':
+            return self._hedging.call(send,tuple(dirs[:2]))
+        return send()
 
     def _handle_response(self,response):
         """
@@ -90,6 +130,14 @@ class Client(object):
         if not all(req_p in params for req_p in req_params):
             raise ParameterRequiredError('Missing required parameter(s) %s' % req_params)
 
+    def _check_order(self,params):
+        """
+        Internal helper to validate (and quantize, if enabled) an order against the symbol table, if one is set. Raises OrderValidationError if the order is invalid; otherwise, returns the parameters to send.
+        """
+        if self.symbol_table is None:
+            return params
+        return self.symbol_table.prepare(params)
+
     # --------------------
     #   PUBLIC API
     # --------------------
@@ -149,6 +197,7 @@ class Client(object):
         # required parameters for creating a new order
         required = ['symbol','side','quantity','price']
         self._check_req_params(required,params)
+        params = self._check_order(params)
         response = self._post('order',data=params)
         return self._handle_response(response)
 
@@ -156,6 +205,7 @@ class Client(object):
         # required parameters for updating an order
         required = ['symbol','side','quantity','price','timeInForce']
         self._check_req_params(required,params)
+        params = self._check_order(params)
         response = self._put('order',clientOrderId,data=params)
         return self._handle_response(response)
 
@@ -11,6 +11,8 @@ class HitBTCError(Exception):
     """
 
 class ParameterRequiredError(HitBTCError): pass
+class ReplayError(HitBTCError): pass
+class OrderValidationError(HitBTCError): pass
 
 # response error handling
 class APIError(HitBTCError):
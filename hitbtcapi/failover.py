@@ -0,0 +1,177 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+import threading
+import time
+
+from .utils import check_uri_security
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker(object):
+    """
+    Health tracking and circuit breaker for a single API endpoint.
+
+    The breaker opens when at least `error_rate` of the last `window` requests (and at least `min_requests`) failed. A request fails when it raises an exception (e.g. a connection error or timeout), gets a 5xx response, or takes longer than `slow_call` seconds (if set). Once `cooldown` seconds have passed, a single probe request is let through: the breaker closes again if it succeeds and reopens if it fails.
+
+    Below that, a closed endpoint is degraded while at least `degraded_rate` of its recent requests failed or its average latency is above `degraded_latency` (if set).
+    """
+    def __init__(self,uri,window=20,error_rate=0.5,min_requests=5,slow_call=None,cooldown=30.0,smoothing=0.2,
+                 degraded_rate=0.2,degraded_latency=None,clock=time.time):
+        self.uri = uri
+        self.error_rate_threshold = error_rate
+        self.degraded_rate = degraded_rate
+        self.degraded_latency = degraded_latency
+        self.min_requests = min_requests
+        self.slow_call = slow_call
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self.state = CLOSED
+        self.latency = None
+        self.opened_at = None
+        self.last_request_at = None
+        self.requests = 0
+        self.failures = 0
+        self._outcomes = collections.deque(maxlen=window)
+        self._probing = False
+        self._resampling = False
+        self._clock = clock
+
+    @property
+    def error_rate(self):
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def degraded(self):
+        if len(self._outcomes) >= self.min_requests and self.error_rate >= self.degraded_rate:
+            return True
+        # an endpoint without traffic yet has no known latency, and is not held against it
+        return self.degraded_latency is not None and self.latency is not None and self.latency > self.degraded_latency
+
+    def resample_due(self):
+        # a degraded endpoint gets no traffic, so it is retried now and then to notice when it recovers
+        return self.last_request_at is None or self._clock() >= self.last_request_at + self.cooldown
+
+    def start_resample(self):
+        self._resampling = True
+
+    def probe_due(self):
+        return self.state != CLOSED and not self._probing and self._clock() >= self.opened_at + self.cooldown
+
+    def start_probe(self):
+        self.state = HALF_OPEN
+        self._probing = True
+
+    def record(self,success,latency):
+        self.requests += 1
+        self.last_request_at = self._clock()
+        if self._resampling:
+            self._resampling = False
+            if success and (self.slow_call is None or latency is None or latency <= self.slow_call):
+                # the degraded endpoint recovered, judge it on fresh requests only
+                self._outcomes.clear()
+                self.latency = None
+        if latency is not None:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+            if self.slow_call is not None and latency > self.slow_call:
+                success = False
+        if not success:
+            self.failures += 1
+        self._outcomes.append(0 if success else 1)
+
+        if self.state == HALF_OPEN:
+            self._probing = False
+            if success:
+                self.state = CLOSED
+                self._outcomes.clear()
+            else:
+                self._open()
+        elif self.state == CLOSED and len(self._outcomes) >= self.min_requests and self.error_rate >= self.error_rate_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = self._clock()
+
+    def status(self):
+        return {
+            'uri': self.uri,
+            'state': self.state,
+            'degraded': self.degraded(),
+            'error_rate': self.error_rate,
+            'latency': self.latency,
+            'requests': self.requests,
+            'failures': self.failures,
+            'opened_at': self.opened_at,
+        }
+
+
+class EndpointPool(object):
+    """
+    Routes requests across an ordered list of API base URIs, each guarded by a `CircuitBreaker`.
+
+    Requests go to the first endpoint in the list whose breaker is closed and which is not degraded, so the primary is kept as long as it is healthy. A degraded endpoint is retried once per `cooldown` so it is used again once it recovers; if every closed endpoint is degraded, the one with the lowest recent error rate is used. An open endpoint is probed with a single request once its cooldown has passed. If every breaker is open, the endpoint which opened first is used rather than failing outright. Keyword arguments configure the breakers.
+
+    Usage:
+        client = Client(api_key,api_secret,base_api_uri=['https://api.hitbtc.com/api/2/','https://api.example.com/api/2/'])
+        client.endpoints.status()
+    """
+    def __init__(self,uris,**breaker_kwargs):
+        if not uris:
+            raise ValueError('At least one base API URI is required')
+        self.breakers = [CircuitBreaker(check_uri_security(uri),**breaker_kwargs) for uri in uris]
+        self._lock = threading.Lock()
+
+    def select(self):
+        """
+        Returns the breaker of the endpoint the next request should go to.
+        """
+        with self._lock:
+            for breaker in self.breakers:
+                if breaker.probe_due():
+                    breaker.start_probe()
+                    return breaker
+            closed = [b for b in self.breakers if b.state == CLOSED]
+            for breaker in closed:
+                if not breaker.degraded():
+                    return breaker
+                if breaker.resample_due():
+                    breaker.start_resample()
+                    return breaker
+            if closed:
+                return min(closed,key=lambda b: b.error_rate)
+            return min(self.breakers,key=lambda b: b.opened_at)
+
+    def call(self,send):
+        """
+        Calls `send` with the base URI of the selected endpoint, recording the outcome.
+        """
+        breaker = self.select()
+        start = time.time()
+        try:
+            response = send(breaker.uri)
+        except Exception:
+            with self._lock:
+                breaker.record(False,None)
+            raise
+        with self._lock:
+            breaker.record(response.status_code < 500,time.time() - start)
+        return response
+
+    def status(self):
+        """
+        Returns the breaker state and health metrics of every endpoint, in order.
+        """
+        with self._lock:
+            return [breaker.status() for breaker in self.breakers]
@@ -0,0 +1,164 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+import threading
+import time
+
+from six.moves import queue
+
+
+class LatencyTracker(object):
+    """
+    Keeps a rolling window of recently observed request latencies (in seconds).
+    """
+    def __init__(self,window=200):
+        self._samples = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def add(self,seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self,percentile):
+        """
+        Returns the given percentile (0-100) of the observed latencies, or None if nothing has been observed yet.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = int(round((len(samples) - 1) * percentile / 100.0))
+        return samples[index]
+
+
+class HedgingPolicy(object):
+    """
+    Hedged requests for idempotent GET calls.
+
+    If the first attempt has not answered after the `percentile` of recently observed latency, a duplicate request is sent over another pooled connection; the first response wins and the other one is discarded. The number of duplicates is capped at `max_ratio` of all requests made through the policy. Latencies are tracked separately for every endpoint `key`, so slow bulk downloads and fast polling calls each get their own threshold, and hedging of an endpoint starts only once `min_samples` of its latencies have been observed.
+
+    Usage:
+        client = Client(api_key,api_secret,hedging=HedgingPolicy(percentile=95,max_ratio=0.05))
+    """
+    def __init__(self,percentile=95,max_ratio=0.1,min_samples=20,min_delay=0.0,window=200):
+        if not 0 < percentile <= 100:
+            raise ValueError('percentile must be in (0, 100]')
+        if max_ratio < 0:
+            raise ValueError('max_ratio must not be negative')
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        # LatencyTracker by endpoint key
+        self.latencies = {}
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def tracker(self,key=None):
+        """
+        Returns the LatencyTracker of an endpoint.
+        """
+        with self._lock:
+            tracker = self.latencies.get(key)
+            if tracker is None:
+                tracker = self.latencies[key] = LatencyTracker(self.window)
+            return tracker
+
+    def delay(self,key=None):
+        """
+        Returns the number of seconds to wait before hedging a request to an endpoint, or None if there is not enough data to hedge yet.
+        """
+        tracker = self.tracker(key)
+        if len(tracker) < self.min_samples:
+            return None
+        return max(tracker.percentile(self.percentile),self.min_delay)
+
+    def _acquire_hedge(self):
+        with self._lock:
+            if self.hedged + 1 > self.max_ratio * self.requests:
+                return False
+            self.hedged += 1
+            return True
+
+    def _timed(self,send,tracker):
+        start = time.time()
+        response = send()
+        tracker.add(time.time() - start)
+        return response
+
+    def call(self,send,key=None):
+        """
+        Calls `send` (which performs a single HTTP request and returns its response), hedging it if it is too slow for the endpoint `key`.
+        """
+        with self._lock:
+            self.requests += 1
+        tracker = self.tracker(key)
+        delay = self.delay(key)
+        if delay is None:
+            return self._timed(send,tracker)
+
+        results = queue.Queue()
+        state = {'done': False}
+        state_lock = threading.Lock()
+
+        def attempt(index):
+            try:
+                response = self._timed(send,tracker)
+            except Exception as e:
+                results.put((index,None,e))
+                return
+            # checking and queueing under the lock ensures a losing response is either closed here or drained below
+            with state_lock:
+                if state['done']:
+                    # this attempt lost the race
+                    response.close()
+                    return
+                results.put((index,response,None))
+
+        def start(index):
+            thread = threading.Thread(target=attempt,args=(index,))
+            thread.daemon = True
+            thread.start()
+
+        start(0)
+        outstanding = 1
+        try:
+            result = results.get(timeout=delay)
+        except queue.Empty:
+            if self._acquire_hedge():
+                start(1)
+                outstanding += 1
+            result = results.get()
+        outstanding -= 1
+        # on failure, give the other attempt the chance to succeed
+        while result[2] is not None and outstanding:
+            result = results.get()
+            outstanding -= 1
+
+        with state_lock:
+            state['done'] = True
+        while True:
+            try:
+                _,response,_ = results.get_nowait()
+            except queue.Empty:
+                break
+            if response is not None:
+                response.close()
+
+        index,response,error = result
+        if error is not None:
+            raise error
+        if index:
+            with self._lock:
+                self.hedge_wins += 1
+        return response
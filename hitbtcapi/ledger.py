@@ -0,0 +1,190 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+from decimal import Decimal
+
+import six
+
+# os.replace is atomic on every platform, but is missing in python 2
+_replace = getattr(os,'replace',os.rename)
+
+
+class Position(object):
+    """
+    Running position of a single symbol, using average cost accounting.
+
+    `quantity` is positive when long and negative when short. `realised_pnl` is in the quote currency and excludes fees, which are summed separately in the fee currency.
+    """
+    __slots__ = ('symbol','quantity','average_cost','realised_pnl','fees','fills')
+
+    def __init__(self,symbol,quantity=0,average_cost=0,realised_pnl=0,fees=0,fills=0):
+        self.symbol = symbol
+        self.quantity = Decimal(quantity)
+        self.average_cost = Decimal(average_cost)
+        self.realised_pnl = Decimal(realised_pnl)
+        self.fees = Decimal(fees)
+        self.fills = fills
+
+    def apply(self,side,quantity,price,fee):
+        signed = quantity if side == 'buy' else -quantity
+        if not self.quantity or (self.quantity > 0) == (signed > 0):
+            # opening or adding to the position
+            total = abs(self.quantity) + quantity
+            self.average_cost = (self.average_cost * abs(self.quantity) + price * quantity) / total
+        else:
+            closed = min(quantity,abs(self.quantity))
+            direction = 1 if self.quantity > 0 else -1
+            self.realised_pnl += closed * (price - self.average_cost) * direction
+            if quantity > closed:
+                # the position flipped, the remainder is opened at this price
+                self.average_cost = price
+            elif closed == abs(self.quantity):
+                self.average_cost = Decimal(0)
+        self.quantity += signed
+        self.fees += fee
+        self.fills += 1
+
+    def unrealised_pnl(self,mark_price):
+        return (Decimal(mark_price) - self.average_cost) * self.quantity
+
+    def as_dict(self):
+        return {
+            'symbol': self.symbol,
+            'quantity': str(self.quantity),
+            'average_cost': str(self.average_cost),
+            'realised_pnl': str(self.realised_pnl),
+            'fees': str(self.fees),
+            'fills': self.fills,
+        }
+
+
+class FillLedger(object):
+    """
+    Persistent, append-only ledger of fills with incrementally maintained positions and PnL.
+
+    Fills are appended to the file at `path` (one JSON object per line), and the positions together with the sync cursor (the highest trade id seen in the trade history) are saved to `path + '.state'`. Opening a ledger only loads the saved state, and `sync` only requests fills past the cursor, so keeping it up to date costs time proportional to the new fills. Fills are deduplicated by trade id.
+
+    Usage:
+        ledger = FillLedger('fills.jsonl')
+        ledger.sync(client)
+        ledger.position('ETHBTC').realised_pnl
+        ledger.unrealised_pnl({'ETHBTC': '0.05'})
+    """
+    def __init__(self,path):
+        self.path = path
+        self.state_path = path + '.state'
+        self.cursor = None
+        self.positions = {}
+        # ids of fills added ahead of the trade history sync, e.g. by sync_order
+        self._pending = set()
+        if os.path.exists(self.state_path):
+            with io.open(self.state_path,'r',encoding='utf-8') as f:
+                state = json.load(f)
+            self.cursor = state['cursor']
+            self._pending = set(state['pending'])
+            for position in state['positions']:
+                self.positions[position['symbol']] = Position(**position)
+
+    def _is_new(self,fill):
+        fill_id = fill['id']
+        if fill_id in self._pending:
+            return False
+        return self.cursor is None or fill_id > self.cursor
+
+    def _apply(self,fills):
+        applied = []
+        for fill in sorted(fills,key=lambda f: f['id']):
+            if self._is_new(fill) and (not applied or fill['id'] != applied[-1]['id']):
+                applied.append(fill)
+        if not applied:
+            return applied
+        with io.open(self.path,'ab') as log:
+            for fill in applied:
+                log.write(json.dumps(fill,sort_keys=True).encode('utf-8') + b'\n')
+        for fill in applied:
+            position = self.positions.get(fill['symbol'])
+            if position is None:
+                position = self.positions[fill['symbol']] = Position(fill['symbol'])
+            position.apply(fill['side'],Decimal(fill['quantity']),Decimal(fill['price']),Decimal(fill.get('fee') or 0))
+        return applied
+
+    def save(self):
+        """
+        Saves the positions and cursor atomically.
+        """
+        state = {
+            'cursor': self.cursor,
+            'pending': sorted(self._pending),
+            'positions': [p.as_dict() for p in six.itervalues(self.positions)],
+        }
+        tmp_path = self.state_path + '.tmp'
+        with io.open(tmp_path,'w',encoding='utf-8') as f:
+            f.write(six.text_type(json.dumps(state,sort_keys=True)))
+        _replace(tmp_path,self.state_path)
+
+    def sync(self,client,limit=1000):
+        """
+        Fetches the fills after the cursor from `Client.get_trade_history`, page by page in ascending id order, and applies them. Returns the list of newly applied fills.
+
+        The cursor covers the whole account, so the history is never filtered (e.g. by symbol): fills left out by a filter would be skipped for good.
+        """
+        applied = []
+        while True:
+            query = {'sort': 'ASC','by': 'id','limit': limit}
+            if self.cursor is not None:
+                query['from'] = self.cursor + 1
+            page = client.get_trade_history(**query)
+            applied.extend(self._apply(page))
+            if page:
+                self.cursor = max([self.cursor or 0] + [fill['id'] for fill in page])
+                self._pending = set(i for i in self._pending if i > self.cursor)
+            self.save()
+            if len(page) < limit:
+                return applied
+
+    def sync_order(self,client,orderId):
+        """
+        Applies the fills of a single order from `Client.get_trades_by_orderid` right away. The trade history is synced first, so that older fills are applied before the order's and average costs stay in fill order; fills of the order which are not in the history yet are applied ahead of the next `sync`. Older fills which only reach the history after that are then applied out of id order, after the order's fills. Returns the list of newly applied fills, including those from the history.
+        """
+        applied = self.sync(client)
+        ahead = self._apply(client.get_trades_by_orderid(orderId))
+        self._pending.update(fill['id'] for fill in ahead)
+        self.save()
+        return applied + ahead
+
+    def fills(self):
+        """
+        Iterates over all fills recorded in the ledger, in the order they were applied.
+        """
+        if not os.path.exists(self.path):
+            return
+        seen = set()
+        with io.open(self.path,'rb') as log:
+            for line in log:
+                fill = json.loads(line.decode('utf-8'))
+                # a crash between writing fills and saving the state can repeat fills in the log
+                if fill['id'] not in seen:
+                    seen.add(fill['id'])
+                    yield fill
+
+    def position(self,symbol):
+        return self.positions.get(symbol) or Position(symbol)
+
+    def realised_pnl(self):
+        """
+        Returns the realised PnL of every symbol, by symbol.
+        """
+        return dict((symbol,p.realised_pnl) for symbol,p in six.iteritems(self.positions))
+
+    def unrealised_pnl(self,mark_prices):
+        """
+        Returns the unrealised PnL of every open position which has a price in `mark_prices` (by symbol), by symbol.
+        """
+        return dict((symbol,p.unrealised_pnl(mark_prices[symbol])) for symbol,p in six.iteritems(self.positions)
+                    if p.quantity and symbol in mark_prices)
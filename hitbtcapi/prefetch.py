@@ -0,0 +1,262 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import heapq
+import itertools
+import threading
+import time
+
+from six.moves import queue
+
+from .errors import RateLimitExceededError
+
+
+def _ticker_price(ticker):
+    return ticker.get('last')
+
+
+def _orderbook_price(orderbook):
+    if not orderbook.get('ask') or not orderbook.get('bid'):
+        return None
+    return (float(orderbook['ask'][0]['price']) + float(orderbook['bid'][0]['price'])) / 2
+
+
+# functions extracting a reference price from a response, used to measure volatility
+_price_extractors = {
+    'ticker': _ticker_price,
+    'orderbook': _orderbook_price,
+}
+
+
+class _Entry(object):
+    __slots__ = ('fetch','price','interval','snapshot','error','volatility','last_price')
+
+    def __init__(self,fetch,price,interval):
+        self.fetch = fetch
+        self.price = price
+        self.interval = interval
+        # (value, time of update), replaced atomically so readers never need a lock
+        self.snapshot = (None,None)
+        self.error = None
+        self.volatility = None
+        self.last_price = None
+
+
+class RefreshScheduler(object):
+    """
+    Keeps registered (endpoint, symbol) pairs fresh in the background so readers never wait on the network.
+
+    `endpoint` is the name of a `Client` getter taking a symbol, without the `get_` prefix (e.g. 'ticker', 'orderbook', 'trades'). Each pair is refreshed around its target interval: faster when its recent volatility is above `volatility_target` (relative price change per refresh), slower when it is below, within a factor of `max_speedup` either way. When the combined pace would exceed `max_rate` requests per second all intervals are stretched, and they back off further while the API reports rate limiting. In the background, due pairs are fetched by up to `workers` threads at once, so one slow request does not hold up the others.
+
+    Usage:
+        scheduler = RefreshScheduler(client,max_rate=20)
+        scheduler.register('orderbook','ETHBTC',0.5)
+        scheduler.start()
+        orderbook,age = scheduler.get('orderbook','ETHBTC')
+    """
+    def __init__(self,client,max_rate=10.0,min_interval=0.05,volatility_target=0.001,max_speedup=4.0,smoothing=0.2,workers=4,clock=time.time):
+        self._client = client
+        self.max_rate = max_rate
+        self.min_interval = min_interval
+        self.volatility_target = volatility_target
+        self.max_speedup = max_speedup
+        self.smoothing = smoothing
+        self.workers = workers
+        self._clock = clock
+        self._entries = {}
+        # running sum of the refresh rate every entry asks for, kept up to date under the lock
+        self._demand = 0.0
+        self._queue = []
+        self._counter = itertools.count()
+        self._backoff = 1.0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._workers = []
+        self._jobs = None
+
+    def register(self,endpoint,symbol,interval,**params):
+        """
+        Registers a pair to be refreshed every `interval` seconds; extra params are passed to the getter. The first refresh is due immediately. Registering a pair again replaces its interval and params, keeping its latest value.
+        """
+        getter = getattr(self._client,'get_' + endpoint)
+        fetch = lambda: getter(symbol,**params)
+        key = (endpoint,symbol)
+        entry = _Entry(fetch,_price_extractors.get(endpoint),interval)
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                entry.snapshot = previous.snapshot
+                self._demand -= self._rate(previous)
+            # queued items of a replaced entry are dropped when they come up
+            self._entries[key] = entry
+            self._demand += self._rate(entry)
+            heapq.heappush(self._queue,(self._clock(),next(self._counter),key,entry))
+        self._wakeup.set()
+
+    def unregister(self,endpoint,symbol):
+        with self._lock:
+            entry = self._entries.pop((endpoint,symbol),None)
+            if entry is not None:
+                self._demand -= self._rate(entry)
+            if not self._entries:
+                # do not carry rounding errors over
+                self._demand = 0.0
+
+    def get(self,endpoint,symbol):
+        """
+        Returns the latest value for a registered pair and its age in seconds, or (None, None) if it has not been fetched yet. Never makes a request.
+        """
+        value,updated = self._entries[(endpoint,symbol)].snapshot
+        if updated is None:
+            return None,None
+        return value,self._clock() - updated
+
+    def error(self,endpoint,symbol):
+        """
+        Returns the error raised by the last refresh of a pair, or None if it succeeded.
+        """
+        return self._entries[(endpoint,symbol)].error
+
+    def next_interval(self,endpoint,symbol):
+        """
+        Returns the number of seconds until the pair is refreshed again after its next refresh, given the current volatility and rate budget.
+        """
+        with self._lock:
+            return self._interval(self._entries[(endpoint,symbol)])
+
+    def _speedup(self,entry):
+        if entry.volatility is None or not self.volatility_target:
+            return 1.0
+        speedup = entry.volatility / self.volatility_target
+        return min(max(speedup,1.0 / self.max_speedup),self.max_speedup)
+
+    def _rate(self,entry):
+        return self._speedup(entry) / entry.interval
+
+    def _interval(self,entry):
+        interval = entry.interval / self._speedup(entry)
+        # stretch all intervals when their combined pace is above the budget
+        if self._demand > self.max_rate:
+            interval *= self._demand / self.max_rate
+        return max(interval * self._backoff,self.min_interval)
+
+    def _refresh(self,key,entry):
+        try:
+            value = entry.fetch()
+        except RateLimitExceededError as e:
+            entry.error = e
+            with self._lock:
+                self._backoff = min(self._backoff * 2,64.0)
+            return
+        except Exception as e:
+            entry.error = e
+            return
+        entry.error = None
+        entry.snapshot = (value,self._clock())
+        with self._lock:
+            self._backoff = max(self._backoff / 2,1.0)
+        price = entry.price(value) if entry.price else None
+        if price is None:
+            return
+        price = float(price)
+        if entry.last_price:
+            change = abs(price - entry.last_price) / entry.last_price
+            with self._lock:
+                registered = self._entries.get(key) is entry
+                if registered:
+                    self._demand -= self._rate(entry)
+                if entry.volatility is None:
+                    entry.volatility = change
+                else:
+                    entry.volatility += self.smoothing * (change - entry.volatility)
+                if registered:
+                    self._demand += self._rate(entry)
+        entry.last_price = price
+
+    def _refresh_and_reschedule(self,key,entry):
+        self._refresh(key,entry)
+        with self._lock:
+            if self._entries.get(key) is entry:
+                heapq.heappush(self._queue,(self._clock() + self._interval(entry),next(self._counter),key,entry))
+        self._wakeup.set()
+
+    def run_pending(self):
+        """
+        Refreshes every pair which is due and reschedules it; when started, the refreshes are handed to the worker threads instead of being made here. Returns the number of seconds until the next refresh is due, or None if nothing is registered.
+        """
+        while True:
+            with self._lock:
+                if not self._queue:
+                    return None
+                due,_,key,entry = self._queue[0]
+                if self._entries.get(key) is not entry:
+                    # unregistered or registered again since it was scheduled
+                    heapq.heappop(self._queue)
+                    continue
+                wait = due - self._clock()
+                if wait > 0:
+                    return wait
+                heapq.heappop(self._queue)
+            # an entry is out of the queue until it has been refreshed, so it is never fetched twice at once
+            if self._jobs is not None:
+                self._jobs.put((key,entry))
+            else:
+                self._refresh_and_reschedule(key,entry)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            # cleared first, so that a wakeup during run_pending is not lost
+            self._wakeup.clear()
+            wait = self.run_pending()
+            self._wakeup.wait(wait)
+
+    def _work(self,jobs):
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            self._refresh_and_reschedule(*job)
+
+    def start(self):
+        """
+        Starts refreshing in a background daemon thread.
+        """
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._jobs = queue.Queue()
+        self._workers = [threading.Thread(target=self._work,args=(self._jobs,)) for _ in range(self.workers)]
+        self._thread = threading.Thread(target=self._run)
+        for thread in self._workers + [self._thread]:
+            thread.daemon = True
+            thread.start()
+
+    def stop(self):
+        """
+        Stops the background threads, waiting for the refreshes in progress.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is None:
+            return
+        self._thread.join()
+        self._thread = None
+        jobs,self._jobs = self._jobs,None
+        # entries still waiting for a worker are put back, so run_pending can pick them up
+        while True:
+            try:
+                key,entry = jobs.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                heapq.heappush(self._queue,(self._clock(),next(self._counter),key,entry))
+        for thread in self._workers:
+            jobs.put(None)
+        for thread in self._workers:
+            thread.join()
+        self._workers = []
@@ -0,0 +1,79 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from .client import Client
+from .errors import api_response_error
+
+
+class RawResponse(object):
+    """
+    Undecoded API response: status code, headers and the body as bytes.
+    """
+    def __init__(self,response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    @property
+    def body(self):
+        """
+        The full response body as bytes. For streamed responses this reads the rest of the body.
+        """
+        return self._response.content
+
+    def view(self):
+        """
+        Returns a memoryview over the body, for slicing without copying.
+        """
+        return memoryview(self.body)
+
+    def iter_content(self,chunk_size=64 * 1024):
+        """
+        Iterates over the body in chunks of bytes without holding all of it in memory (when streaming).
+        """
+        return self._response.iter_content(chunk_size)
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc_info):
+        self.close()
+
+
+class RawClient(Client):
+    """
+    API Client returning undecoded `RawResponse` objects from every getter instead of decoded JSON.
+
+    Errors are still detected and raised as subclasses of `hitbtcapi.errors.APIError`. With `stream=True` response bodies are not downloaded until they are read, so large history pulls can be copied through in chunks with `iter_content`.
+
+    Usage:
+        client = RawClient(api_key,api_secret,stream=True)
+        with client.get_candles('ETHBTC',period='M1',limit=1000) as response:
+            for chunk in response.iter_content():
+                sink.write(chunk)
+    """
+    def __init__(self,key,secret,base_api_uri=None,stream=False,**kwargs):
+        super(RawClient,self).__init__(key,secret,base_api_uri,**kwargs)
+        self._stream = stream
+
+    def _request(self,method,*dirs,**kwargs):
+        if self._stream:
+            kwargs.setdefault('stream',True)
+        return super(RawClient,self)._request(method,*dirs,**kwargs)
+
+    def _handle_response(self,response):
+        """
+        Internal helper raising the appropriate exception when response is not 200; otherwise, returns the undecoded response.
+        """
+        if response.status_code != 200:
+            try:
+                raise api_response_error(response)
+            finally:
+                response.close()
+        return RawResponse(response)
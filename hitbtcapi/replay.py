@@ -0,0 +1,162 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+import io
+import json
+import threading
+import time
+
+import six
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .compat import urlparse
+from .errors import ReplayError
+
+# Recordings are a sequence of records, each made of a one-line JSON header
+# followed by the raw response body and a newline:
+#
+#   {"t": start time, "d": duration, "m": method, "p": path, "q": params,
+#    "s": status code, "r": reason, "h": headers, "n": body length}
+#   <n bytes of body>
+#
+# Only headers are parsed when a recording is opened; bodies are read from
+# disk by offset when they are replayed.
+
+
+def _params_key(kwargs):
+    """
+    Returns a hashable, order-independent representation of the query or form parameters of a request.
+    """
+    params = kwargs.get('params') or kwargs.get('data') or {}
+    return sorted([six.text_type(k),six.text_type(v)] for k,v in six.iteritems(params) if v is not None)
+
+
+def _request_key(method,uri,kwargs):
+    return (method,urlparse(uri).path,json.dumps(_params_key(kwargs)))
+
+
+class RecordingTransport(object):
+    """
+    Transport recording every request/response pair passing through another transport to a file.
+
+    Usage:
+        transport = RecordingTransport(RequestsTransport(requests.session()),'session.rec')
+        client = Client(api_key,api_secret,transport=transport)
+    """
+    def __init__(self,transport,path):
+        self._transport = transport
+        self._file = io.open(path,'ab')
+        self._lock = threading.Lock()
+
+    def request(self,method,uri,**kwargs):
+        start = time.time()
+        response = self._transport.request(method,uri,**kwargs)
+        body = response.content
+        header = {
+            't': start,
+            'd': time.time() - start,
+            'm': method,
+            'p': urlparse(uri).path,
+            'q': _params_key(kwargs),
+            's': response.status_code,
+            'r': response.reason,
+            'h': dict(response.headers),
+            'n': len(body),
+        }
+        record = json.dumps(header,separators=(',',':')).encode('utf-8') + b'\n' + body + b'\n'
+        with self._lock:
+            self._file.write(record)
+            self._file.flush()
+        return response
+
+    def close(self):
+        self._file.close()
+
+
+class ReplayTransport(object):
+    """
+    Transport answering requests from a recording made with `RecordingTransport`, without touching the network.
+
+    Requests are matched by method, path and parameters. Repeated identical requests get the recorded responses in order; the last one is repeated once they run out. With `speed=None` responses are returned immediately; otherwise the recorded timeline is replayed `speed` times faster than real time. `latency` adds a delay to every response: either 'recorded' for the recorded latencies (scaled by `speed`) or a callable taking `(method,path)` and returning seconds.
+
+    Usage:
+        client = Client(api_key,api_secret,transport=ReplayTransport('session.rec',speed=50))
+    """
+    def __init__(self,path,speed=None,latency=None,clock=time.time,sleep=time.sleep):
+        if speed is not None and speed <= 0:
+            raise ValueError('speed must be positive')
+        self.speed = speed
+        self.latency = latency
+        self._clock = clock
+        self._sleep = sleep
+        self._file = io.open(path,'rb')
+        self._index = collections.defaultdict(list)
+        self._cursors = collections.defaultdict(int)
+        self._first_time = None
+        self._start = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        while True:
+            line = self._file.readline()
+            if not line:
+                break
+            header = json.loads(line.decode('utf-8'))
+            offset = self._file.tell()
+            self._file.seek(header['n'] + 1,io.SEEK_CUR)
+            key = (header['m'],header['p'],json.dumps(header['q']))
+            self._index[key].append((header,offset))
+            if self._first_time is None or header['t'] < self._first_time:
+                self._first_time = header['t']
+
+    def __len__(self):
+        return sum(len(records) for records in six.itervalues(self._index))
+
+    def _delay(self,method,path,header):
+        delay = 0.0
+        if self.latency == 'recorded':
+            delay = header['d'] / (self.speed or 1)
+        elif self.latency is not None:
+            delay = self.latency(method,path)
+        if self.speed is not None:
+            # do not answer before the recorded response time on the scaled timeline
+            due = self._start + (header['t'] + header['d'] - self._first_time) / self.speed
+            delay = max(delay,due - self._clock())
+        return delay
+
+    def request(self,method,uri,**kwargs):
+        key = _request_key(method,uri,kwargs)
+        with self._lock:
+            records = self._index.get(key)
+            if not records:
+                raise ReplayError('No recorded response for %s %s %s' % key)
+            if self._start is None:
+                self._start = self._clock()
+            cursor = self._cursors[key]
+            header,offset = records[min(cursor,len(records) - 1)]
+            self._cursors[key] = cursor + 1
+            self._file.seek(offset)
+            body = self._file.read(header['n'])
+        delay = self._delay(method,key[1],header)
+        if delay > 0:
+            self._sleep(delay)
+
+        response = Response()
+        response.status_code = header['s']
+        response.reason = header['r']
+        response.headers = CaseInsensitiveDict(header['h'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = uri
+        response._content = body
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        self._file.close()
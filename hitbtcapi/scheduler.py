@@ -0,0 +1,159 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import collections
+import itertools
+import threading
+import time
+
+# priority classes, highest first
+CANCEL = 0
+ORDER = 1
+ACCOUNT = 2
+MARKET_DATA = 3
+
+PRIORITY_NAMES = {
+    CANCEL: 'cancel',
+    ORDER: 'order',
+    ACCOUNT: 'account',
+    MARKET_DATA: 'market_data',
+}
+
+
+def classify(method,dirs):
+    """
+    Returns the priority class of a request to the given API path.
+    """
+    section = dirs[0] if dirs else None
+    if section == 'order':
+        if method == 'delete':
+            return CANCEL
+        if method != 'get':
+            return ORDER
+        return ACCOUNT
+    if section == 'public':
+        return MARKET_DATA
+    return ACCOUNT
+
+
+class _ClassStats(object):
+    __slots__ = ('queue','in_flight','requests','wait_total','wait_max')
+
+    def __init__(self):
+        self.queue = collections.deque()
+        self.in_flight = 0
+        self.requests = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class RequestScheduler(object):
+    """
+    Schedules API requests by priority class: cancels, then order entry, then account, then market data.
+
+    At most `max_concurrency` requests are in flight at once. `reserved` maps a class to a number of slots which only that class and higher ones may use, so that e.g. market data polling can never occupy every connection. With `rate` set (requests per second, with up to one second of burst), `headroom` maps a class to the fraction of the rate budget which must remain unused after its request; lower classes wait first when the budget runs low. Waiting requests are always started highest class first, in arrival order within a class.
+
+    Usage:
+        client = Client(api_key,api_secret,scheduler=RequestScheduler(max_concurrency=8,rate=100))
+        client.scheduler.stats()
+    """
+    def __init__(self,max_concurrency=8,reserved=None,rate=None,headroom=None,clock=time.time):
+        if reserved is None:
+            reserved = {CANCEL: 2,ORDER: 1}
+        if headroom is None:
+            headroom = {ACCOUNT: 0.1,MARKET_DATA: 0.25}
+        if sum(reserved.values()) >= max_concurrency:
+            raise ValueError('Reserved slots must leave at least one slot for every class')
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        # concurrency limit of each class, leaving the slots reserved for higher classes
+        self._limits = dict((p,max_concurrency - sum(n for q,n in reserved.items() if q < p)) for p in PRIORITY_NAMES)
+        self._headroom = dict((p,headroom.get(p,0.0) * (rate or 0)) for p in PRIORITY_NAMES)
+        self._clock = clock
+        self._tokens = float(rate or 0)
+        self._refilled = clock()
+        self._in_flight = 0
+        self._stats = dict((p,_ClassStats()) for p in PRIORITY_NAMES)
+        self._tickets = itertools.count()
+        self._condition = threading.Condition()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self._tokens + (now - self._refilled) * self.rate,self.rate)
+        self._refilled = now
+
+    def _blocked(self,priority,ticket):
+        """
+        Returns False if the request can start now, otherwise the number of seconds to wait (None when waiting for a slot).
+        """
+        if self._stats[priority].queue[0] != ticket:
+            return None
+        for higher in range(priority):
+            if self._stats[higher].queue:
+                return None
+        if self._in_flight >= self._limits[priority]:
+            return None
+        if self.rate:
+            self._refill()
+            missing = 1 + self._headroom[priority] - self._tokens
+            if missing > 0:
+                return missing / self.rate
+        return False
+
+    def acquire(self,priority):
+        stats = self._stats[priority]
+        start = self._clock()
+        with self._condition:
+            ticket = next(self._tickets)
+            stats.queue.append(ticket)
+            try:
+                while True:
+                    wait = self._blocked(priority,ticket)
+                    if wait is False:
+                        break
+                    self._condition.wait(wait)
+            finally:
+                stats.queue.remove(ticket)
+            self._in_flight += 1
+            if self.rate:
+                self._tokens -= 1
+            waited = self._clock() - start
+            stats.in_flight += 1
+            stats.requests += 1
+            stats.wait_total += waited
+            stats.wait_max = max(stats.wait_max,waited)
+            # the next request in line may be able to start as well
+            self._condition.notify_all()
+
+    def release(self,priority):
+        with self._condition:
+            self._in_flight -= 1
+            self._stats[priority].in_flight -= 1
+            self._condition.notify_all()
+
+    def run(self,priority,func):
+        """
+        Calls `func` once the request can start under its priority class.
+        """
+        self.acquire(priority)
+        try:
+            return func()
+        finally:
+            self.release(priority)
+
+    def stats(self):
+        """
+        Returns the queue depth, in-flight requests and wait-time metrics (in seconds) of each priority class, by class name.
+        """
+        with self._condition:
+            return dict((PRIORITY_NAMES[p],{
+                'queued': len(s.queue),
+                'in_flight': s.in_flight,
+                'requests': s.requests,
+                'wait_total': s.wait_total,
+                'wait_max': s.wait_max,
+                'wait_mean': s.wait_total / s.requests if s.requests else 0.0,
+            }) for p,s in self._stats.items())
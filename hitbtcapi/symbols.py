@@ -0,0 +1,143 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from decimal import Decimal
+from decimal import InvalidOperation
+from decimal import ROUND_DOWN
+from decimal import ROUND_UP
+
+import six
+
+from .errors import OrderValidationError
+
+
+def _decimal(value):
+    # go through str so that floats are taken at their printed value
+    value = Decimal(value if isinstance(value,(Decimal,six.string_types)) else str(value))
+    # NaN and Infinity parse fine but are never valid prices or quantities
+    if not value.is_finite():
+        raise InvalidOperation('%s is not a finite number' % value)
+    return value
+
+
+def _round_to_step(value,step,rounding):
+    return ((value / step).to_integral_value(rounding) * step).quantize(step)
+
+
+class SymbolRules(object):
+    """
+    Trading rules of a single symbol, as returned by `Client.get_symbols`.
+    """
+    __slots__ = ('id','base_currency','quote_currency','tick_size','quantity_increment','fee_currency','min_notional')
+
+    def __init__(self,symbol,min_notional=None):
+        self.id = symbol['id']
+        self.base_currency = symbol.get('baseCurrency')
+        self.quote_currency = symbol.get('quoteCurrency')
+        self.tick_size = Decimal(symbol['tickSize'])
+        self.quantity_increment = Decimal(symbol['quantityIncrement'])
+        self.fee_currency = symbol.get('feeCurrency')
+        self.min_notional = _decimal(min_notional) if min_notional is not None else None
+
+
+class SymbolTable(object):
+    """
+    Hash-indexed table of symbol trading rules for validating orders locally, before they are sent.
+
+    Orders are checked for a known symbol, a price which is a multiple of `tickSize`, a quantity which is a multiple of `quantityIncrement` and, when configured per quote currency in `min_notional`, a minimum order value. With `quantize=True` price and quantity are first rounded to the nearest valid values which are not more aggressive: buy prices round down, sell prices round up and quantities round down.
+
+    Usage:
+        table = SymbolTable.from_client(client,min_notional={'BTC': '0.0001'},quantize=True)
+        client = Client(api_key,api_secret,symbol_table=table)
+    """
+    def __init__(self,symbols,min_notional=None,quantize=False):
+        min_notional = min_notional or {}
+        self.quantize_orders = quantize
+        self._rules = {}
+        for symbol in symbols:
+            rules = SymbolRules(symbol,min_notional.get(symbol.get('quoteCurrency')))
+            self._rules[rules.id] = rules
+
+    @classmethod
+    def from_client(cls,client,**kwargs):
+        return cls(client.get_symbols(),**kwargs)
+
+    def __getitem__(self,symbol):
+        return self._rules[symbol]
+
+    def __contains__(self,symbol):
+        return symbol in self._rules
+
+    def __len__(self):
+        return len(self._rules)
+
+    def _rules_for(self,order):
+        try:
+            return self._rules[order['symbol']]
+        except KeyError:
+            raise OrderValidationError('Unknown symbol %s' % order.get('symbol'))
+
+    def quantize(self,order):
+        """
+        Returns a copy of the order with price and quantity rounded to the symbol's tick size and quantity increment.
+        """
+        rules = self._rules_for(order)
+        order = dict(order)
+        try:
+            if order.get('price') is not None:
+                rounding = ROUND_UP if order.get('side') == 'sell' else ROUND_DOWN
+                order['price'] = format(_round_to_step(_decimal(order['price']),rules.tick_size,rounding),'f')
+            if order.get('quantity') is not None:
+                order['quantity'] = format(_round_to_step(_decimal(order['quantity']),rules.quantity_increment,ROUND_DOWN),'f')
+        except InvalidOperation:
+            raise OrderValidationError('Invalid price or quantity for %s' % rules.id)
+        return order
+
+    def validate(self,order):
+        """
+        Raises OrderValidationError if the order breaks the trading rules of its symbol.
+        """
+        rules = self._rules_for(order)
+        try:
+            self._check(order,rules)
+        except (KeyError,InvalidOperation):
+            # also raised by the checks for values with more digits than the decimal context allows
+            raise OrderValidationError('Invalid price or quantity for %s' % rules.id)
+
+    def _check(self,order,rules):
+        quantity = _decimal(order['quantity'])
+        price = _decimal(order['price']) if order.get('price') is not None else None
+        if quantity <= 0 or quantity % rules.quantity_increment:
+            raise OrderValidationError('Quantity %s of %s is not a positive multiple of %s' % (quantity,rules.id,rules.quantity_increment))
+        if price is None:
+            return
+        if price <= 0 or price % rules.tick_size:
+            raise OrderValidationError('Price %s of %s is not a positive multiple of %s' % (price,rules.id,rules.tick_size))
+        if rules.min_notional is not None and price * quantity < rules.min_notional:
+            raise OrderValidationError('Value %s of %s order is below the minimum of %s' % (price * quantity,rules.id,rules.min_notional))
+
+    def prepare(self,order):
+        """
+        Quantizes the order if enabled, then validates it. Returns the order to send.
+        """
+        if self.quantize_orders:
+            order = self.quantize(order)
+        self.validate(order)
+        return order
+
+    def validate_batch(self,orders):
+        """
+        Validates a batch of orders (e.g. a whole ladder) without stopping at the first failure. Returns a list with an OrderValidationError for each invalid order and None for each valid one.
+        """
+        errors = []
+        for order in orders:
+            try:
+                self.validate(order)
+            except OrderValidationError as e:
+                errors.append(e)
+            else:
+                errors.append(None)
+        return errors
@@ -0,0 +1,104 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import requests
+import six
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class RequestsTransport(object):
+    """
+    Default transport, sending requests through a `requests` session.
+
+    A transport is any object with a `request(method,uri,**kwargs)` method, where `method` is a lowercase HTTP method name and `kwargs` are `requests`-style arguments (`params`, `data`, `auth`, `stream`), returning a `requests.Response`-like object.
+    """
+    def __init__(self,session):
+        self.session = session
+
+    def request(self,method,uri,**kwargs):
+        return getattr(self.session,method)(uri,**kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+def _encode_values(values):
+    """
+    Encodes query or form values the way `requests` does: None is dropped and other values are converted to strings.
+    """
+    if not values:
+        return None
+    return dict((k,v if isinstance(v,six.string_types) else str(v)) for k,v in six.iteritems(values) if v is not None)
+
+
+class _StreamedBody(object):
+    """
+    Internal file-like wrapper letting `requests.Response` read a streamed httpx response.
+    """
+    def __init__(self,response):
+        self._response = response
+
+    def stream(self,chunk_size,decode_content=True):
+        for chunk in self._response.iter_bytes(chunk_size):
+            yield chunk
+
+    def read(self,amount=None):
+        return self._response.read()
+
+    def close(self):
+        self._response.close()
+
+
+class HTTP2Transport(object):
+    """
+    Transport multiplexing concurrent requests over a single HTTP/2 connection, using httpx.
+
+    Responses are converted to `requests.Response` objects, so error handling through `hitbtcapi.errors.api_response_error` is unchanged, and httpx connection and timeout errors are raised as their `requests` equivalents. Requires the optional `httpx[http2]` dependency (`pip install hitbtcapi[http2]`).
+
+    Usage:
+        client = Client(api_key,api_secret,transport=HTTP2Transport())
+    """
+    def __init__(self,timeout=None,**client_kwargs):
+        if httpx is None:
+            raise ImportError("HTTP2Transport requires httpx with HTTP/2 support: pip install 'httpx[http2]'")
+        client_kwargs.setdefault('http2',True)
+        self.client = httpx.Client(timeout=timeout,**client_kwargs)
+
+    def request(self,method,uri,params=None,data=None,auth=None,stream=False,timeout=None):
+        try:
+            request = self.client.build_request(method.upper(),uri,params=_encode_values(params),
+                                                data=_encode_values(data),
+                                                timeout=timeout if timeout is not None else self.client.timeout)
+            response = self.client.send(request,auth=auth,stream=stream)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e)
+        return self._convert(response,uri,stream)
+
+    def _convert(self,response,uri,stream):
+        converted = Response()
+        converted.status_code = response.status_code
+        converted.reason = response.reason_phrase
+        converted.headers = CaseInsensitiveDict(response.headers.multi_items())
+        converted.encoding = get_encoding_from_headers(converted.headers)
+        converted.url = uri
+        if stream:
+            converted.raw = _StreamedBody(response)
+        else:
+            converted._content = response.content
+            converted._content_consumed = True
+        return converted
+
+    def close(self):
+        self.client.close()
@@ -3,6 +3,8 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import calendar
+import datetime
 import warnings
 import inspect
 
@@ -24,3 +26,25 @@ def method_name():
     Returns the current active function name as a string
     """
     return inspect.stack()[1][3]
+
+
+def parse_timestamp(timestamp):
+    """
+    Converts an ISO 8601 timestamp as returned by the HitBTC API (e.g. '2017-10-20T20:00:00.000Z') to seconds since the epoch.
+    """
+    timestamp = timestamp.rstrip('Z')
+    if '.' in timestamp:
+        timestamp,fraction = timestamp.split('.',1)
+        fraction = float('0.' + fraction)
+    else:
+        fraction = 0.0
+    parsed = datetime.datetime.strptime(timestamp,'%Y-%m-%dT%H:%M:%S')
+    return calendar.timegm(parsed.timetuple()) + fraction
+
+
+def format_timestamp(seconds):
+    """
+    Converts seconds since the epoch to an ISO 8601 timestamp in the format used by the HitBTC API.
+    """
+    formatted = datetime.datetime.utcfromtimestamp(int(seconds)).strftime('%Y-%m-%dT%H:%M:%S')
+    return '%s.%03dZ' % (formatted,int(round((seconds % 1) * 1000)) % 1000)
@@ -0,0 +1,157 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import six
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _rate(value):
+    return float(value) if value else 0.0
+
+
+class ValuationEngine(object):
+    """
+    Values balances in a single quote currency using the best conversion paths through the exchange's cross rates.
+
+    The symbols form a graph of currencies where selling the base currency converts at the bid and buying it converts at the inverse of the ask (the last price is used when either is missing). The best path of at most `max_hops` conversions from every currency to `quote_currency` is computed once with vectorised relaxation; ticker updates then only change edge rates, and prices are recomputed along the fixed paths with array operations. Call `rebuild_paths` to re-optimise paths after large moves. Requires the optional `numpy` dependency (`pip install hitbtcapi[valuation]`).
+
+    Usage:
+        engine = ValuationEngine(client.get_symbols(),client.get_tickers(),quote_currency='USD')
+        engine.value(client.get_trading_balance()) + engine.value(client.get_account_balance())
+        engine.update_tickers([client.get_ticker('ETHBTC')])
+    """
+    def __init__(self,symbols,tickers,quote_currency='USD',max_hops=3):
+        if np is None:
+            raise ImportError("ValuationEngine requires numpy: pip install numpy")
+        if max_hops < 1:
+            raise ValueError('max_hops must be at least 1')
+        self.quote_currency = quote_currency
+        self.max_hops = max_hops
+
+        currencies = set([quote_currency])
+        for symbol in symbols:
+            currencies.update((symbol['baseCurrency'],symbol['quoteCurrency']))
+        self.currencies = sorted(currencies)
+        self._index = dict((c,i) for i,c in enumerate(self.currencies))
+
+        # two directed edges per symbol: base -> quote and quote -> base
+        self._edges = {}
+        src,dst = [],[]
+        for symbol in symbols:
+            base,quote = self._index[symbol['baseCurrency']],self._index[symbol['quoteCurrency']]
+            self._edges[symbol['id']] = len(src)
+            src.extend((base,quote))
+            dst.extend((quote,base))
+        self._src = np.array(src,dtype=np.intp)
+        self._dst = np.array(dst,dtype=np.intp)
+        # the extra last rate is an identity edge used to pad paths
+        self._rates = np.zeros(len(src) + 1)
+        self._rates[-1] = 1.0
+        self._identity = len(src)
+
+        self.update_tickers(tickers)
+        self.rebuild_paths()
+
+    def update_tickers(self,tickers):
+        """
+        Updates the conversion rates of the given tickers (as returned by `Client.get_tickers` or `Client.get_ticker`). Tickers of unknown symbols are ignored.
+        """
+        for ticker in tickers:
+            edge = self._edges.get(ticker.get('symbol'))
+            if edge is None:
+                continue
+            last = _rate(ticker.get('last'))
+            bid = _rate(ticker.get('bid')) or last
+            ask = _rate(ticker.get('ask')) or last
+            self._rates[edge] = bid
+            self._rates[edge + 1] = 1.0 / ask if ask else 0.0
+        self._prices = None
+
+    def rebuild_paths(self):
+        """
+        Recomputes the best conversion path of every currency from the current rates.
+        """
+        n = len(self.currencies)
+        target = self._index[self.quote_currency]
+        values = np.zeros(n)
+        values[target] = 1.0
+        paths = np.full((n,self.max_hops),self._identity,dtype=np.intp)
+        rates = self._rates[:-1]
+        for _ in six.moves.range(self.max_hops):
+            candidates = rates * values[self._dst]
+            # best candidate edge for every source currency
+            order = np.lexsort((-candidates,self._src))
+            sources = self._src[order]
+            first = np.ones(len(order),dtype=bool)
+            first[1:] = sources[1:] != sources[:-1]
+            best = order[first]
+            best_src = self._src[best]
+            improved = (candidates[best] > values[best_src]) & (best_src != target)
+            best,best_src = best[improved],best_src[improved]
+            new_values = values.copy()
+            new_values[best_src] = candidates[best]
+            new_paths = paths.copy()
+            new_paths[best_src,0] = best
+            new_paths[best_src,1:] = paths[self._dst[best],:-1]
+            values,paths = new_values,new_paths
+        self._paths = paths
+        self._reachable = values > 0
+        self._prices = None
+
+    def prices(self):
+        """
+        Returns an array with the price of every currency (in `currencies` order) in the quote currency; 0 where no path exists.
+        """
+        if self._prices is None:
+            prices = self._rates[self._paths].prod(axis=1)
+            prices[~self._reachable] = 0.0
+            self._prices = prices
+        return self._prices
+
+    def price(self,currency):
+        return float(self.prices()[self._index[currency]])
+
+    def path(self,currency):
+        """
+        Returns the conversion path of a currency as a list of (symbol, side) pairs, where side is 'sell' for base -> quote.
+        """
+        symbols = dict((edge,symbol) for symbol,edge in six.iteritems(self._edges))
+        path = []
+        for edge in self._paths[self._index[currency]]:
+            if edge == self._identity:
+                break
+            path.append((symbols[edge - edge % 2],'sell' if edge % 2 == 0 else 'buy'))
+        return path
+
+    def balance_vector(self,balances):
+        """
+        Converts balances (as returned by `Client.get_trading_balance` or `Client.get_account_balance`) to an array of amounts in `currencies` order. Available and reserved amounts are both counted; unknown currencies are ignored.
+        """
+        vector = np.zeros(len(self.currencies))
+        for balance in balances:
+            index = self._index.get(balance['currency'])
+            if index is not None:
+                vector[index] += float(balance.get('available') or 0) + float(balance.get('reserved') or 0)
+        return vector
+
+    def value(self,balances):
+        """
+        Returns the total value of balances in the quote currency.
+        """
+        return float(self.balance_vector(balances).dot(self.prices()))
+
+    def value_many(self,accounts):
+        """
+        Values many accounts (e.g. sub-accounts) at once. Returns an array with the total value of each list of balances.
+        """
+        if not accounts:
+            return np.zeros(0)
+        matrix = np.vstack([self.balance_vector(balances) for balances in accounts])
+        return matrix.dot(self.prices())
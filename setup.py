@@ -74,6 +74,10 @@ setup(
     keywords=['hitbtc', 'api', 'client', 'bitcoin', 'altcoin', 'trading'],
     include_package_data=True,
     install_requires=install_requires,
+    extras_require={
+        'http2': ['httpx[http2]'],
+        'valuation': ['numpy'],
+    },
     dependency_links=dependency_links,
     test_suite='nose.collector',
     tests_require=tests_requires,
@@ -0,0 +1,83 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import unittest2
+
+from hitbtcapi.candles import CandleAggregator
+from hitbtcapi.candles import period_seconds
+
+
+def mock_trade(trade_id,timestamp,price,quantity):
+    return {'id': trade_id,'price': price,'quantity': quantity,'side': 'buy',
+            'timestamp': '2017-10-20T%s.000Z' % timestamp}
+
+
+class TestCandleAggregator(unittest2.TestCase):
+    def test_period_seconds(self):
+        self.assertEqual(period_seconds('M15'),900)
+        self.assertEqual(period_seconds(90),90)
+        with self.assertRaises(ValueError):
+            period_seconds('1M')
+        with self.assertRaises(ValueError):
+            period_seconds(0)
+
+    def test_trades_are_aggregated_for_all_intervals(self):
+        aggregator = CandleAggregator(['M1',120])
+        aggregator.add_trades([
+            mock_trade(4,'20:01:10','12','1'),
+            mock_trade(3,'20:00:50','9','1'),
+            mock_trade(2,'20:00:20','11','2'),
+            mock_trade(1,'20:00:05','10','1'),
+        ])
+        minute = aggregator.candles('M1')
+        self.assertEqual(len(minute),2)
+        self.assertEqual(minute[0],{'timestamp': '2017-10-20T20:00:00.000Z',
+                                    'open': '10','close': '9','min': '9','max': '11',
+                                    'volume': '4','volumeQuote': '41'})
+        two_minutes = aggregator.candles(120)
+        self.assertEqual(len(two_minutes),1)
+        self.assertEqual(two_minutes[0]['close'],'12')
+        self.assertEqual(two_minutes[0]['volume'],'5')
+        self.assertEqual(aggregator.current('M1')['open'],'12')
+
+    def test_duplicate_trades_are_ignored(self):
+        aggregator = CandleAggregator(['M1'])
+        page = [mock_trade(1,'20:00:05','10','1'),mock_trade(2,'20:00:20','11','2')]
+        aggregator.add_trades(page)
+        aggregator.add_trades(page)
+        self.assertEqual(aggregator.current('M1')['volume'],'3')
+
+    def test_gaps_are_filled_and_buffer_is_bounded(self):
+        aggregator = CandleAggregator(['M1'],maxlen=3)
+        aggregator.add_trade(mock_trade(1,'20:00:05','10','1'))
+        aggregator.add_trade(mock_trade(2,'20:02:05','12','1'))
+        candles = aggregator.candles('M1')
+        self.assertEqual([c['timestamp'][11:19] for c in candles],['20:00:00','20:01:00','20:02:00'])
+        self.assertEqual(candles[1]['close'],'10')
+        self.assertEqual(candles[1]['volume'],'0')
+        aggregator.add_trade(mock_trade(3,'20:10:05','13','1'))
+        self.assertEqual(len(aggregator.candles('M1')),3)
+        self.assertEqual(aggregator.candles('M1',limit=1)[0]['open'],'13')
+
+    def test_seed_from_candles(self):
+        aggregator = CandleAggregator(['M1','M3',90])
+        candles = [
+            {'timestamp': '2017-10-20T20:00:00.000Z','open': '10','close': '11','min': '9','max': '12','volume': '1','volumeQuote': '10'},
+            {'timestamp': '2017-10-20T20:01:00.000Z','open': '11','close': '13','min': '11','max': '14','volume': '2','volumeQuote': '25'},
+        ]
+        aggregator.seed(candles,'M1')
+        self.assertEqual(len(aggregator.candles('M1')),2)
+        self.assertEqual(aggregator.candles('M3')[0],{'timestamp': '2017-10-20T20:00:00.000Z',
+                                                      'open': '10','close': '13','min': '9','max': '14',
+                                                      'volume': '3','volumeQuote': '35'})
+        # 90 seconds is not a multiple of the candle period
+        self.assertEqual(aggregator.candles(90),[])
+        # trades inside the seeded candles are already accounted for
+        aggregator.add_trade(mock_trade(1,'20:01:30','20','1'))
+        self.assertEqual(aggregator.candles('M3')[0]['volume'],'3')
+        aggregator.add_trade(mock_trade(2,'20:02:30','15','1'))
+        self.assertEqual(aggregator.candles('M3')[0]['close'],'15')
+        self.assertEqual(aggregator.candles('M1')[-1]['open'],'15')
@@ -0,0 +1,156 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+import warnings
+
+import httpretty as hp
+import requests
+import unittest2
+
+from hitbtcapi import errors
+from hitbtcapi import failover
+from hitbtcapi.client import Client
+
+# Hide all warning output.
+warnings.showwarning = lambda *a, **k: None
+
+api_key = 'fakeapikey'
+api_secret = 'fakeapisecret'
+
+primary = 'https://api.hitbtc.com/api/2/'
+secondary = 'https://api2.hitbtc.com/api/2/'
+
+
+class MockResponse(object):
+    def __init__(self,status_code):
+        self.status_code = status_code
+
+
+class TestCircuitBreaker(unittest2.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = failover.CircuitBreaker(primary,window=4,error_rate=0.5,min_requests=4,
+                                               slow_call=1.0,cooldown=10,clock=lambda: self.now)
+
+    def test_opens_on_error_rate(self):
+        for success in (True,False,True):
+            self.breaker.record(success,0.1)
+        self.assertEqual(self.breaker.state,failover.CLOSED)
+        # slow calls count as failures
+        self.breaker.record(True,2.0)
+        self.assertEqual(self.breaker.state,failover.OPEN)
+        self.assertEqual(self.breaker.status()['failures'],2)
+
+    def test_probe_recovers_or_reopens(self):
+        for _ in range(4):
+            self.breaker.record(False,None)
+        self.assertFalse(self.breaker.probe_due())
+        self.now = 10
+        self.assertTrue(self.breaker.probe_due())
+        self.breaker.start_probe()
+        self.assertFalse(self.breaker.probe_due())
+        self.breaker.record(False,None)
+        self.assertEqual(self.breaker.state,failover.OPEN)
+        self.now = 20
+        self.breaker.start_probe()
+        self.breaker.record(True,0.1)
+        self.assertEqual(self.breaker.state,failover.CLOSED)
+        self.assertEqual(self.breaker.error_rate,0.0)
+
+
+class TestEndpointPool(unittest2.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.used = []
+
+    def send(self,status_code):
+        def request(base):
+            self.used.append(base)
+            return MockResponse(status_code)
+        return request
+
+    def test_primary_is_sticky(self):
+        pool = failover.EndpointPool([primary,secondary],clock=lambda: self.now)
+        # an isolated error does not move traffic off the primary
+        for i in range(50):
+            pool.call(self.send(503 if i == 10 else 200))
+        for _ in range(1000):
+            pool.call(self.send(200))
+        self.assertEqual(set(self.used),set([primary]))
+        self.assertIsNone(pool.status()[1]['latency'])
+
+    def test_degraded_endpoint_is_skipped_and_resampled(self):
+        pool = failover.EndpointPool([primary,secondary],window=10,min_requests=5,cooldown=5,clock=lambda: self.now)
+        for i in range(10):
+            pool.call(self.send(503 if i >= 8 else 200))
+        self.assertTrue(pool.status()[0]['degraded'])
+        self.assertEqual(pool.status()[0]['state'],failover.CLOSED)
+        pool.call(self.send(200))
+        pool.call(self.send(200))
+        self.assertEqual(self.used[-2:],[secondary,secondary])
+        # the primary is retried once its cooldown has passed, and used again once healthy
+        self.now = 5
+        for _ in range(3):
+            pool.call(self.send(200))
+        self.assertEqual(self.used[-3:],[primary,primary,primary])
+        self.assertFalse(pool.status()[0]['degraded'])
+
+    def test_degraded_on_latency(self):
+        pool = failover.EndpointPool([primary,secondary],degraded_latency=0.5,clock=lambda: self.now)
+        self.assertIs(pool.select(),pool.breakers[0])
+        pool.breakers[0].record(True,1.0)
+        self.assertIs(pool.select(),pool.breakers[1])
+        # every closed endpoint degraded: the lowest error rate wins, then list order
+        pool.breakers[1].record(True,1.0)
+        self.assertIs(pool.select(),pool.breakers[0])
+
+    def test_open_endpoint_is_probed(self):
+        pool = failover.EndpointPool([primary,secondary],min_requests=2,cooldown=5,clock=lambda: self.now)
+        pool.call(self.send(503))
+        pool.call(self.send(503))
+        self.assertEqual(pool.status()[0]['state'],failover.OPEN)
+        pool.call(self.send(200))
+        self.assertEqual(self.used[-1],secondary)
+
+        def refuse(base):
+            self.used.append(base)
+            raise requests.exceptions.ConnectionError()
+        # the primary is probed once its cooldown has passed
+        self.now = 5
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            pool.call(refuse)
+        self.assertEqual(self.used[-1],primary)
+        self.assertEqual(pool.status()[0]['state'],failover.OPEN)
+        self.now = 10
+        pool.call(self.send(200))
+        self.assertEqual(self.used[-1],primary)
+        self.assertEqual(pool.status()[0]['state'],failover.CLOSED)
+        pool.call(self.send(200))
+        self.assertEqual(self.used[-1],primary)
+
+    def test_every_endpoint_open(self):
+        pool = failover.EndpointPool([primary,secondary],min_requests=1,cooldown=5,clock=lambda: self.now)
+        pool.breakers[1].record(False,None)
+        self.now = 1
+        pool.breakers[0].record(False,None)
+        self.assertIs(pool.select(),pool.breakers[1])
+
+    @hp.activate
+    def test_client_fails_over(self):
+        hp.register_uri(hp.GET,re.compile(r'https://api\.hitbtc\.com/.*ticker$'),status=503,body='')
+        hp.register_uri(hp.GET,re.compile(r'https://api2\.hitbtc\.com/.*ticker$'),body='[]')
+        client = Client(api_key,api_secret,base_api_uri=failover.EndpointPool([primary,secondary],min_requests=1))
+        self.assertEqual(client.BASE_API_URI,primary)
+        with self.assertRaises(errors.ServiceUnavailableError):
+            client.get_tickers()
+        self.assertEqual(client.get_tickers(),[])
+        status = client.endpoints.status()
+        self.assertEqual([s['state'] for s in status],[failover.OPEN,failover.CLOSED])
+
+    def test_insecure_endpoint_warns(self):
+        with self.assertWarns(UserWarning):
+            Client(api_key,api_secret,base_api_uri=[primary,'http://api2.hitbtc.com/api/2/'])
@@ -0,0 +1,120 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+import threading
+import time
+import warnings
+
+import httpretty as hp
+import unittest2
+
+from hitbtcapi.client import Client
+from hitbtcapi.hedging import HedgingPolicy
+from hitbtcapi.hedging import LatencyTracker
+
+# Hide all warning output.
+warnings.showwarning = lambda *a, **k: None
+
+
+class MockResponse(object):
+    def __init__(self,name):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def warmed_up_policy(latency=0.01,**kwargs):
+    policy = HedgingPolicy(min_samples=5,**kwargs)
+    for _ in range(5):
+        policy.tracker().add(latency)
+    return policy
+
+
+class TestHedging(unittest2.TestCase):
+    def test_latency_percentile(self):
+        tracker = LatencyTracker(window=100)
+        self.assertIsNone(tracker.percentile(50))
+        for i in range(1,101):
+            tracker.add(i)
+        self.assertEqual(tracker.percentile(0),1)
+        self.assertEqual(tracker.percentile(100),100)
+        self.assertEqual(tracker.percentile(50),51)
+
+    def test_no_hedging_without_enough_samples(self):
+        policy = HedgingPolicy(min_samples=5)
+        self.assertIsNone(policy.delay())
+        response = MockResponse('first')
+        self.assertIs(policy.call(lambda: response),response)
+        self.assertEqual(policy.hedged,0)
+        self.assertEqual(len(policy.tracker()),1)
+
+    def test_slow_request_is_hedged_and_loser_closed(self):
+        policy = warmed_up_policy(max_ratio=1.0)
+        release = threading.Event()
+        responses = []
+        def send():
+            response = MockResponse(len(responses))
+            responses.append(response)
+            if response.name == 0:
+                release.wait(1)
+            return response
+        winner = policy.call(send)
+        release.set()
+        self.assertEqual(winner.name,1)
+        self.assertEqual(policy.hedged,1)
+        self.assertEqual(policy.hedge_wins,1)
+        for _ in range(100):
+            if responses[0].closed:
+                break
+            time.sleep(0.01)
+        self.assertTrue(responses[0].closed)
+        self.assertFalse(winner.closed)
+
+    def test_latency_is_tracked_per_endpoint(self):
+        policy = HedgingPolicy(min_samples=5)
+        for _ in range(5):
+            policy.call(lambda: MockResponse('orderbook'),('public','orderbook'))
+            policy.tracker(('public','candles')).add(2.0)
+        self.assertLess(policy.delay(('public','orderbook')),0.1)
+        self.assertEqual(policy.delay(('public','candles')),2.0)
+        self.assertIsNone(policy.delay(('history','trades')))
+
+    def test_hedging_is_capped(self):
+        policy = warmed_up_policy(max_ratio=0.0)
+        def send():
+            time.sleep(0.05)
+            return MockResponse('only')
+        self.assertEqual(policy.call(send).name,'only')
+        self.assertEqual(policy.hedged,0)
+
+    def test_failed_attempt_falls_back_to_hedge(self):
+        policy = warmed_up_policy(max_ratio=1.0)
+        calls = []
+        def send():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise IOError('connection reset')
+            return MockResponse('hedge')
+        self.assertEqual(policy.call(send).name,'hedge')
+
+    @hp.activate
+    def test_client_never_hedges_mutating_requests(self):
+        policy = warmed_up_policy(max_ratio=1.0)
+        client = Client('fakeapikey','fakeapisecret',hedging=policy)
+        for method in (hp.GET,hp.POST,hp.PUT,hp.PATCH,hp.DELETE):
+            hp.register_uri(method,re.compile('.*test$'),body='{}')
+        self.assertEqual(client._get('test').status_code,200)
+        self.assertEqual(policy.requests,1)
+        self.assertEqual(len(policy.tracker(('test',))),1)
+        client._post('test')
+        client._put('test')
+        client._patch('test')
+        client._delete('test')
+        self.assertEqual(policy.requests,1)
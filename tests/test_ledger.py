@@ -0,0 +1,127 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+
+import unittest2
+
+from hitbtcapi.ledger import FillLedger
+from hitbtcapi.ledger import Position
+
+
+def mock_fill(fill_id,side,quantity,price,fee='0',symbol='ETHBTC',orderId=1):
+    return {'id': fill_id,'orderId': orderId,'clientOrderId': 'foo','symbol': symbol,'side': side,
+            'quantity': quantity,'price': price,'fee': fee,'timestamp': '2017-10-20T20:00:00.000Z'}
+
+
+class MockClient(object):
+    def __init__(self,fills):
+        self.fills = fills
+        # ids of fills not in the trade history yet
+        self.delayed = set()
+        self.calls = []
+
+    def get_trade_history(self,**params):
+        self.calls.append(params)
+        fills = [f for f in self.fills if f['id'] >= params.get('from',0) and f['id'] not in self.delayed]
+        return sorted(fills,key=lambda f: f['id'])[:params['limit']]
+
+    def get_trades_by_orderid(self,orderId,**params):
+        return [f for f in self.fills if f['orderId'] == orderId]
+
+
+class TestPosition(unittest2.TestCase):
+    def test_average_cost_and_realised_pnl(self):
+        position = Position('ETHBTC')
+        position.apply('buy',Decimal('2'),Decimal('10'),Decimal('0.1'))
+        position.apply('buy',Decimal('2'),Decimal('20'),Decimal('0.1'))
+        self.assertEqual(position.average_cost,Decimal('15'))
+        position.apply('sell',Decimal('1'),Decimal('25'),Decimal('0.1'))
+        self.assertEqual(position.quantity,Decimal('3'))
+        self.assertEqual(position.realised_pnl,Decimal('10'))
+        self.assertEqual(position.unrealised_pnl('17'),Decimal('6'))
+        # flip to short: 3 closed at 11, 1 opened at 11
+        position.apply('sell',Decimal('4'),Decimal('11'),Decimal('0'))
+        self.assertEqual(position.quantity,Decimal('-1'))
+        self.assertEqual(position.realised_pnl,Decimal('-2'))
+        self.assertEqual(position.average_cost,Decimal('11'))
+        self.assertEqual(position.unrealised_pnl('10'),Decimal('1'))
+        position.apply('buy',Decimal('1'),Decimal('9'),Decimal('0'))
+        self.assertEqual(position.quantity,0)
+        self.assertEqual(position.average_cost,0)
+        self.assertEqual(position.realised_pnl,Decimal('0'))
+        self.assertEqual(position.fees,Decimal('0.3'))
+
+
+class TestFillLedger(unittest2.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory,'fills.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_sync_is_incremental_and_persistent(self):
+        client = MockClient([mock_fill(i,'buy','1','10',fee='0.01') for i in range(1,6)])
+        ledger = FillLedger(self.path)
+        self.assertEqual(len(ledger.sync(client,limit=2)),5)
+        self.assertEqual(len(client.calls),3)
+        self.assertEqual(ledger.cursor,5)
+        self.assertEqual(ledger.position('ETHBTC').quantity,Decimal('5'))
+        self.assertEqual(ledger.position('ETHBTC').fees,Decimal('0.05'))
+
+        client.fills.append(mock_fill(6,'sell','2','12',orderId=2))
+        client.calls = []
+        ledger = FillLedger(self.path)
+        self.assertEqual(ledger.position('ETHBTC').quantity,Decimal('5'))
+        self.assertEqual([f['id'] for f in ledger.sync(client,limit=2)],[6])
+        self.assertEqual(client.calls[0]['from'],6)
+        self.assertEqual(ledger.position('ETHBTC').quantity,Decimal('3'))
+        self.assertEqual(ledger.realised_pnl(),{'ETHBTC': Decimal('4')})
+        self.assertEqual(ledger.unrealised_pnl({'ETHBTC': '11','LTCBTC': '1'}),{'ETHBTC': Decimal('3')})
+        self.assertEqual([f['id'] for f in ledger.fills()],[1,2,3,4,5,6])
+
+    def test_fills_are_deduplicated(self):
+        client = MockClient([mock_fill(1,'buy','1','10'),mock_fill(2,'buy','1','10',orderId=2)])
+        ledger = FillLedger(self.path)
+        ledger._apply([mock_fill(1,'buy','1','10'),mock_fill(1,'buy','1','10')])
+        self.assertEqual(ledger.position('ETHBTC').quantity,Decimal('1'))
+        ledger = FillLedger(self.path)
+        # the history is synced first, then fills of the order which are not in it yet are applied ahead of it
+        client.fills.append(mock_fill(4,'buy','1','16',orderId=3))
+        client.delayed = set([4])
+        self.assertEqual([f['id'] for f in ledger.sync_order(client,3)],[1,2,4])
+        self.assertEqual(ledger.sync_order(client,3),[])
+        client.fills.insert(2,mock_fill(3,'sell','1','18'))
+        client.delayed = set()
+        self.assertEqual([f['id'] for f in ledger.sync(client)],[3])
+        self.assertEqual(ledger.sync(client),[])
+        # fill 3 reached the history after fill 4 was applied, so it is applied out of id order:
+        # in id order the sell would close at an average cost of 10 (realised 8, average 13 after)
+        position = ledger.position('ETHBTC')
+        self.assertEqual(position.quantity,Decimal('2'))
+        self.assertEqual(position.realised_pnl,Decimal('6'))
+        self.assertEqual(position.average_cost,Decimal('12'))
+
+    def test_sync_order_keeps_fill_order(self):
+        client = MockClient([mock_fill(1,'buy','1','10'),mock_fill(2,'buy','1','20',orderId=2),mock_fill(3,'sell','1','18',orderId=3)])
+        ledger = FillLedger(self.path)
+        ledger.sync_order(client,2)
+        ledger.sync(client)
+        self.assertEqual(ledger.position('ETHBTC').realised_pnl,Decimal('3'))
+        self.assertEqual(ledger.position('ETHBTC').average_cost,Decimal('15'))
+
+    def test_sync_covers_every_symbol(self):
+        client = MockClient([mock_fill(i,'buy','1','10',symbol='ETHBTC' if i % 2 else 'LTCBTC') for i in range(1,8)])
+        ledger = FillLedger(self.path)
+        self.assertEqual([f['id'] for f in ledger.sync(client,limit=3)],list(range(1,8)))
+        self.assertEqual(len(client.calls),3)
+        self.assertNotIn('symbol',client.calls[0])
+        self.assertEqual(ledger.position('ETHBTC').quantity,Decimal('4'))
+        self.assertEqual(ledger.position('LTCBTC').quantity,Decimal('3'))
@@ -0,0 +1,162 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import threading
+import time
+
+import unittest2
+
+from hitbtcapi import errors
+from hitbtcapi.prefetch import RefreshScheduler
+
+
+class MockClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class MockClient(object):
+    def __init__(self):
+        self.calls = []
+        self.prices = {}
+        self.fail_with = None
+        self.blocked = {}
+
+    def get_ticker(self,symbol,**params):
+        self.calls.append(('ticker',symbol))
+        if symbol in self.blocked:
+            self.blocked[symbol].wait(5)
+        if self.fail_with:
+            raise self.fail_with
+        return {'symbol': symbol,'last': str(self.prices.get(symbol,100))}
+
+    def get_orderbook(self,symbol,**params):
+        self.calls.append(('orderbook',symbol,params))
+        return {'ask': [{'price': '101','size': '1'}],'bid': [{'price': '99','size': '1'}]}
+
+
+class TestRefreshScheduler(unittest2.TestCase):
+    def setUp(self):
+        self.clock = MockClock()
+        self.client = MockClient()
+
+    def test_get_never_calls_the_client(self):
+        scheduler = RefreshScheduler(self.client,clock=self.clock)
+        scheduler.register('ticker','ETHBTC',1.0)
+        self.assertEqual(scheduler.get('ticker','ETHBTC'),(None,None))
+        self.assertEqual(self.client.calls,[])
+
+        self.assertAlmostEqual(scheduler.run_pending(),1.0)
+        self.clock.now += 0.25
+        value,age = scheduler.get('ticker','ETHBTC')
+        self.assertEqual(value['symbol'],'ETHBTC')
+        self.assertAlmostEqual(age,0.25)
+        self.assertEqual(len(self.client.calls),1)
+
+    def test_pairs_are_refreshed_when_due(self):
+        scheduler = RefreshScheduler(self.client,clock=self.clock)
+        scheduler.register('ticker','ETHBTC',1.0)
+        scheduler.register('orderbook','ETHBTC',2.0,limit=5)
+        scheduler.run_pending()
+        self.assertEqual(self.client.calls,[('ticker','ETHBTC'),('orderbook','ETHBTC',{'limit': 5})])
+        self.clock.now += 1.0
+        scheduler.run_pending()
+        self.assertEqual(len(self.client.calls),3)
+        scheduler.unregister('ticker','ETHBTC')
+        self.clock.now += 1.0
+        scheduler.run_pending()
+        self.assertEqual(self.client.calls[-1][0],'orderbook')
+        self.assertEqual(len(self.client.calls),4)
+
+    def test_register_again_replaces_the_pair(self):
+        scheduler = RefreshScheduler(self.client,volatility_target=0,clock=self.clock)
+        for _ in range(3):
+            scheduler.register('ticker','ETHBTC',1.0)
+        scheduler.run_pending()
+        self.assertEqual(len(self.client.calls),1)
+        scheduler.register('ticker','ETHBTC',2.0)
+        self.assertIsNotNone(scheduler.get('ticker','ETHBTC')[0])
+        scheduler.run_pending()
+        self.assertEqual(len(self.client.calls),2)
+        for _ in range(10):
+            self.clock.now += 1.0
+            scheduler.run_pending()
+        self.assertEqual(len(self.client.calls),7)
+        self.assertEqual(len(scheduler._queue),1)
+
+    def test_interval_adapts_to_volatility(self):
+        scheduler = RefreshScheduler(self.client,volatility_target=0.01,smoothing=1.0,clock=self.clock)
+        scheduler.register('ticker','ETHBTC',1.0)
+        scheduler.run_pending()
+        self.assertAlmostEqual(scheduler.next_interval('ticker','ETHBTC'),1.0)
+        # a 2% move is twice the target, so refresh twice as often
+        self.client.prices['ETHBTC'] = 102
+        self.clock.now += 1.0
+        scheduler.run_pending()
+        self.assertAlmostEqual(scheduler.next_interval('ticker','ETHBTC'),0.5)
+        # no movement, slow down to the maximum
+        self.clock.now += 1.0
+        scheduler.run_pending()
+        self.assertAlmostEqual(scheduler.next_interval('ticker','ETHBTC'),4.0)
+
+    def test_demand_is_kept_up_to_date(self):
+        scheduler = RefreshScheduler(self.client,volatility_target=0.01,smoothing=1.0,clock=self.clock)
+        scheduler.register('ticker','ETHBTC',1.0)
+        scheduler.register('ticker','LTCBTC',0.5)
+        scheduler.register('ticker','LTCBTC',2.0)
+        scheduler.run_pending()
+        self.client.prices['ETHBTC'] = 102
+        self.clock.now += 4.0
+        scheduler.run_pending()
+        self.assertAlmostEqual(scheduler._demand,sum(scheduler._rate(e) for e in scheduler._entries.values()))
+        self.assertAlmostEqual(scheduler._demand,2.0 / 1.0 + 0.25 / 2.0)
+        scheduler.unregister('ticker','ETHBTC')
+        scheduler.unregister('ticker','LTCBTC')
+        self.assertEqual(scheduler._demand,0.0)
+
+    def test_interval_respects_rate_budget_and_backs_off(self):
+        scheduler = RefreshScheduler(self.client,max_rate=1.0,clock=self.clock)
+        scheduler.register('ticker','ETHBTC',1.0)
+        scheduler.register('ticker','LTCBTC',1.0)
+        self.assertAlmostEqual(scheduler.next_interval('ticker','ETHBTC'),2.0)
+
+        self.client.fail_with = errors.RateLimitExceededError(429,'Too many requests','')
+        scheduler.run_pending()
+        self.assertIsInstance(scheduler.error('ticker','ETHBTC'),errors.RateLimitExceededError)
+        self.assertEqual(scheduler.get('ticker','ETHBTC'),(None,None))
+        self.assertAlmostEqual(scheduler.next_interval('ticker','ETHBTC'),8.0)
+
+    def test_background_thread(self):
+        scheduler = RefreshScheduler(self.client,min_interval=0.01)
+        scheduler.start()
+        try:
+            scheduler.register('ticker','ETHBTC',0.01)
+            for _ in range(100):
+                if scheduler.get('ticker','ETHBTC')[0] is not None:
+                    break
+                time.sleep(0.01)
+        finally:
+            scheduler.stop()
+        self.assertIsNotNone(scheduler.get('ticker','ETHBTC')[0])
+
+    def test_slow_fetch_does_not_hold_up_other_pairs(self):
+        self.client.blocked['LTCBTC'] = threading.Event()
+        scheduler = RefreshScheduler(self.client,max_rate=1000,min_interval=0.01,volatility_target=0,workers=2)
+        scheduler.register('ticker','LTCBTC',0.01)
+        scheduler.register('ticker','ETHBTC',0.01)
+        scheduler.start()
+        try:
+            for _ in range(100):
+                if self.client.calls.count(('ticker','ETHBTC')) >= 3:
+                    break
+                time.sleep(0.01)
+        finally:
+            self.client.blocked['LTCBTC'].set()
+            scheduler.stop()
+        self.assertGreaterEqual(self.client.calls.count(('ticker','ETHBTC')),3)
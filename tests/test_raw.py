@@ -0,0 +1,60 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import re
+import warnings
+
+import httpretty as hp
+import six
+import unittest2
+
+from hitbtcapi import errors
+from hitbtcapi.raw import RawClient
+from hitbtcapi.raw import RawResponse
+
+# Hide all warning output.
+warnings.showwarning = lambda *a, **k: None
+
+api_key = 'fakeapikey'
+api_secret = 'fakeapisecret'
+
+mock_collection = [{'key1': 'val1'},{'key2': 'val2'}]
+
+
+class TestRawClient(unittest2.TestCase):
+    @hp.activate
+    def test_getters_return_undecoded_body(self):
+        body = json.dumps(mock_collection)
+        hp.register_uri(hp.GET,re.compile('.*public/candles/foo$'),body=body,content_type='application/json')
+        client = RawClient(api_key,api_secret)
+        response = client.get_candles('foo',period='M1')
+        self.assertIsInstance(response,RawResponse)
+        self.assertEqual(response.status_code,200)
+        self.assertIn('json',response.headers['content-type'])
+        self.assertIsInstance(response.body,six.binary_type)
+        self.assertEqual(response.body,body.encode('utf-8'))
+        self.assertEqual(response.view()[:1].tobytes(),b'[')
+
+    @hp.activate
+    def test_streamed_body(self):
+        body = json.dumps(mock_collection * 100)
+        hp.register_uri(hp.GET,re.compile('.*public/trades/foo$'),body=body)
+        client = RawClient(api_key,api_secret,stream=True)
+        with client.get_trades('foo') as response:
+            chunks = list(response.iter_content(chunk_size=64))
+        self.assertGreater(len(chunks),1)
+        self.assertEqual(b''.join(chunks),body.encode('utf-8'))
+
+    @hp.activate
+    def test_errors_are_raised(self):
+        error_body = {'error': {'code': 2001,'message': 'Symbol not found','description': ''}}
+        for stream in (False,True):
+            hp.register_uri(hp.GET,re.compile('.*public/orderbook/foo$'),
+                            body=json.dumps(error_body),status=400,content_type='application/json')
+            client = RawClient(api_key,api_secret,stream=stream)
+            with self.assertRaises(errors.InvalidRequestError):
+                client.get_orderbook('foo')
@@ -0,0 +1,98 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import warnings
+
+import httpretty as hp
+import requests
+import unittest2
+
+from hitbtcapi import errors
+from hitbtcapi.client import Client
+from hitbtcapi.replay import RecordingTransport
+from hitbtcapi.replay import ReplayTransport
+from hitbtcapi.transport import RequestsTransport
+
+# Hide all warning output.
+warnings.showwarning = lambda *a, **k: None
+
+api_key = 'fakeapikey'
+api_secret = 'fakeapisecret'
+
+
+class MockClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self,seconds):
+        self.now += seconds
+
+
+class TestReplay(unittest2.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory,'session.rec')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @hp.activate
+    def record(self):
+        hp.register_uri(hp.GET,re.compile('.*public/ticker/ETHBTC$'),
+                        responses=[hp.Response(body=json.dumps({'last': '1'})),
+                                   hp.Response(body=json.dumps({'last': '2'}))])
+        hp.register_uri(hp.GET,re.compile('.*public/orderbook/ETHBTC$'),body=json.dumps({'ask': []}))
+        hp.register_uri(hp.POST,re.compile('.*order$'),status=400,content_type='application/json',
+                        body=json.dumps({'error': {'message': 'Insufficient funds'}}))
+        transport = RecordingTransport(RequestsTransport(requests.session()),self.path)
+        client = Client(api_key,api_secret,transport=transport)
+        client.get_ticker('ETHBTC')
+        client.get_ticker('ETHBTC')
+        client.get_orderbook('ETHBTC',limit=5)
+        with self.assertRaises(errors.InvalidRequestError):
+            client.create_order(symbol='ETHBTC',side='buy',quantity='1',price='1')
+        transport.close()
+
+    def test_replay_matches_recorded_requests(self):
+        self.record()
+        transport = ReplayTransport(self.path)
+        self.assertEqual(len(transport),4)
+        client = Client(api_key,api_secret,transport=transport)
+        self.assertEqual(client.get_ticker('ETHBTC'),{'last': '1'})
+        self.assertEqual(client.get_ticker('ETHBTC'),{'last': '2'})
+        # the last response is repeated once recorded ones run out
+        self.assertEqual(client.get_ticker('ETHBTC'),{'last': '2'})
+        self.assertEqual(client.get_orderbook('ETHBTC',limit=5),{'ask': []})
+        with self.assertRaises(errors.InvalidRequestError):
+            client.create_order(price='1',quantity='1',side='buy',symbol='ETHBTC')
+        with self.assertRaises(errors.ReplayError):
+            client.get_orderbook('ETHBTC',limit=10)
+        transport.close()
+
+    def test_replay_pacing_and_latency(self):
+        self.record()
+        clock = MockClock()
+        transport = ReplayTransport(self.path,latency=lambda method,path: 0.5,clock=clock,sleep=clock.sleep)
+        client = Client(api_key,api_secret,transport=transport)
+        client.get_ticker('ETHBTC')
+        client.get_ticker('ETHBTC')
+        self.assertAlmostEqual(clock.now,1.0)
+        transport.close()
+
+        clock = MockClock()
+        transport = ReplayTransport(self.path,speed=1e9,clock=clock,sleep=clock.sleep)
+        client = Client(api_key,api_secret,transport=transport)
+        client.get_orderbook('ETHBTC',limit=5)
+        self.assertLess(clock.now,1e-3)
+        transport.close()
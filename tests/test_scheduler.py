@@ -0,0 +1,104 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import re
+import threading
+import time
+import warnings
+
+import httpretty as hp
+import unittest2
+
+from hitbtcapi import scheduler as sched
+from hitbtcapi.client import Client
+
+# Hide all warning output.
+warnings.showwarning = lambda *a, **k: None
+
+
+def wait_until(condition):
+    for _ in range(200):
+        if condition():
+            return
+        time.sleep(0.005)
+    raise AssertionError('condition not met')
+
+
+class TestRequestScheduler(unittest2.TestCase):
+    def test_classify(self):
+        self.assertEqual(sched.classify('delete',('order',)),sched.CANCEL)
+        self.assertEqual(sched.classify('delete',('order','foo')),sched.CANCEL)
+        self.assertEqual(sched.classify('post',('order',)),sched.ORDER)
+        self.assertEqual(sched.classify('patch',('order','foo')),sched.ORDER)
+        self.assertEqual(sched.classify('get',('order','foo')),sched.ACCOUNT)
+        self.assertEqual(sched.classify('get',('trading','balance')),sched.ACCOUNT)
+        self.assertEqual(sched.classify('get',('public','orderbook','foo')),sched.MARKET_DATA)
+
+    def test_reserved_slots(self):
+        with self.assertRaises(ValueError):
+            sched.RequestScheduler(max_concurrency=3,reserved={sched.CANCEL: 3})
+        scheduler = sched.RequestScheduler(max_concurrency=2,reserved={sched.CANCEL: 1})
+        scheduler.acquire(sched.MARKET_DATA)
+        started = []
+        def market_data():
+            scheduler.run(sched.MARKET_DATA,lambda: started.append('market_data'))
+        thread = threading.Thread(target=market_data)
+        thread.start()
+        wait_until(lambda: scheduler.stats()['market_data']['queued'] == 1)
+        # the last slot is kept for cancels
+        scheduler.run(sched.CANCEL,lambda: started.append('cancel'))
+        self.assertEqual(started,['cancel'])
+        scheduler.release(sched.MARKET_DATA)
+        thread.join()
+        self.assertEqual(started,['cancel','market_data'])
+
+        stats = scheduler.stats()
+        self.assertEqual(stats['market_data']['requests'],2)
+        self.assertEqual(stats['market_data']['queued'],0)
+        self.assertEqual(stats['market_data']['in_flight'],0)
+        self.assertGreater(stats['market_data']['wait_max'],0)
+        self.assertEqual(stats['cancel']['requests'],1)
+
+    def test_waiting_requests_start_by_priority(self):
+        scheduler = sched.RequestScheduler(max_concurrency=1,reserved={})
+        scheduler.acquire(sched.ACCOUNT)
+        started = []
+        threads = []
+        for priority in (sched.MARKET_DATA,sched.ORDER,sched.CANCEL):
+            thread = threading.Thread(target=scheduler.run,args=(priority,lambda p=priority: started.append(p)))
+            thread.start()
+            threads.append(thread)
+            wait_until(lambda: sum(s['queued'] for s in scheduler.stats().values()) == len(threads))
+        scheduler.release(sched.ACCOUNT)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(started,[sched.CANCEL,sched.ORDER,sched.MARKET_DATA])
+
+    def test_rate_headroom(self):
+        clock = [0.0]
+        scheduler = sched.RequestScheduler(rate=4,headroom={sched.MARKET_DATA: 0.5},clock=lambda: clock[0])
+        scheduler.run(sched.MARKET_DATA,lambda: None)
+        scheduler.run(sched.MARKET_DATA,lambda: None)
+        with scheduler._condition:
+            scheduler._stats[sched.MARKET_DATA].queue.append('next')
+            self.assertAlmostEqual(scheduler._blocked(sched.MARKET_DATA,'next'),0.25)
+            scheduler._stats[sched.MARKET_DATA].queue.clear()
+            scheduler._stats[sched.CANCEL].queue.append('next')
+            self.assertIs(scheduler._blocked(sched.CANCEL,'next'),False)
+            scheduler._stats[sched.CANCEL].queue.clear()
+
+    @hp.activate
+    def test_client_requests_are_scheduled(self):
+        scheduler = sched.RequestScheduler()
+        client = Client('fakeapikey','fakeapisecret',scheduler=scheduler)
+        hp.register_uri(hp.GET,re.compile('.*public/ticker/foo$'),body='{}')
+        hp.register_uri(hp.DELETE,re.compile('.*order$'),body='[]')
+        client.get_ticker('foo')
+        client.cancel_open_orders()
+        stats = scheduler.stats()
+        self.assertEqual(stats['market_data']['requests'],1)
+        self.assertEqual(stats['cancel']['requests'],1)
+        self.assertEqual(stats['order']['requests'],0)
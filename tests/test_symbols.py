@@ -0,0 +1,102 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import re
+import warnings
+
+import httpretty as hp
+import unittest2
+
+from hitbtcapi import errors
+from hitbtcapi.client import Client
+from hitbtcapi.symbols import SymbolTable
+
+# Hide all warning output.
+warnings.showwarning = lambda *a, **k: None
+
+api_key = 'fakeapikey'
+api_secret = 'fakeapisecret'
+
+mock_symbols = [
+    {'id': 'ETHBTC','baseCurrency': 'ETH','quoteCurrency': 'BTC','quantityIncrement': '0.001',
+     'tickSize': '0.000001','takeLiquidityRate': '0.001','provideLiquidityRate': '-0.0001','feeCurrency': 'BTC'},
+    {'id': 'BTCUSD','baseCurrency': 'BTC','quoteCurrency': 'USD','quantityIncrement': '0.01',
+     'tickSize': '0.5','takeLiquidityRate': '0.001','provideLiquidityRate': '-0.0001','feeCurrency': 'USD'},
+]
+
+
+def mock_order(symbol='ETHBTC',side='buy',quantity='0.5',price='0.05'):
+    return {'symbol': symbol,'side': side,'quantity': quantity,'price': price}
+
+
+class TestSymbolTable(unittest2.TestCase):
+    def setUp(self):
+        self.table = SymbolTable(mock_symbols,min_notional={'USD': '10'})
+
+    def test_rules_are_indexed_by_symbol(self):
+        self.assertEqual(len(self.table),2)
+        self.assertIn('ETHBTC',self.table)
+        self.assertEqual(str(self.table['BTCUSD'].tick_size),'0.5')
+        self.assertEqual(self.table['ETHBTC'].fee_currency,'BTC')
+
+    def test_validate(self):
+        self.table.validate(mock_order())
+        self.table.validate(mock_order(quantity=0.5,price=0.05))
+        invalid = [
+            mock_order(symbol='FOOBAR'),
+            mock_order(quantity='0.0005'),
+            mock_order(quantity='0'),
+            mock_order(price='0.0500005'),
+            mock_order(price='abc'),
+            mock_order(price='NaN'),
+            mock_order(price=float('nan')),
+            mock_order(quantity='Infinity'),
+            mock_order(quantity=float('inf')),
+            mock_order(quantity='1e30'),
+            mock_order(price='1e30'),
+            mock_order(symbol='BTCUSD',quantity='0.01',price='999.5'),
+        ]
+        for order in invalid:
+            with self.assertRaises(errors.OrderValidationError):
+                self.table.validate(order)
+        self.table.validate(mock_order(symbol='BTCUSD',quantity='0.01',price='1000'))
+
+    def test_quantize(self):
+        self.assertEqual(self.table.quantize(mock_order(quantity='0.5009',price='0.0500009')),
+                         mock_order(quantity='0.500',price='0.050000'))
+        self.assertEqual(self.table.quantize(mock_order(side='sell',price='0.0500001'))['price'],'0.050001')
+        self.assertEqual(self.table.quantize(mock_order(symbol='BTCUSD',price='1000.2'))['price'],'1000.0')
+        self.assertEqual(self.table.quantize(mock_order(symbol='BTCUSD',side='sell',price='1000.2'))['price'],'1000.5')
+        for order in [mock_order(price='NaN'),mock_order(quantity='-Infinity'),mock_order(quantity='1e30')]:
+            with self.assertRaises(errors.OrderValidationError):
+                self.table.quantize(order)
+
+    def test_validate_batch(self):
+        ladder = [mock_order(price='0.05'),mock_order(price='0.0500005'),mock_order(price='NaN'),mock_order(quantity='1e30'),mock_order(price='0.049999')]
+        result = self.table.validate_batch(ladder)
+        self.assertIsNone(result[0])
+        for error in result[1:4]:
+            self.assertIsInstance(error,errors.OrderValidationError)
+        self.assertIsNone(result[4])
+
+    @hp.activate
+    def test_client_validates_orders_locally(self):
+        hp.register_uri(hp.GET,re.compile('.*public/symbol$'),body=json.dumps(mock_symbols))
+        sent = []
+        def mock_response(request,uri,headers):
+            sent.append(request.body.decode('utf-8'))
+            return 200,headers,json.dumps({'status': 'new'})
+        hp.register_uri(hp.POST,re.compile('.*order$'),mock_response)
+        client = Client(api_key,api_secret)
+        client.symbol_table = SymbolTable.from_client(client)
+        with self.assertRaises(errors.OrderValidationError):
+            client.create_order(**mock_order(price='0.0500005'))
+        self.assertEqual(sent,[])
+
+        client.symbol_table = SymbolTable(mock_symbols,quantize=True)
+        self.assertEqual(client.create_order(**mock_order(price='0.0500005')),{'status': 'new'})
+        self.assertIn('price=0.050000',sent[0])
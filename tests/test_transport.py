@@ -0,0 +1,68 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import json
+import warnings
+
+import requests
+import unittest2
+
+from hitbtcapi import errors
+from hitbtcapi import transport as transports
+from hitbtcapi.client import Client
+
+# Hide all warning output.
+warnings.showwarning = lambda *a, **k: None
+
+api_key = 'fakeapikey'
+api_secret = 'fakeapisecret'
+
+mock_items = {'key1': 'val1','key2': 'val2'}
+
+
+@unittest2.skipIf(transports.httpx is None,'httpx is not installed')
+class TestHTTP2Transport(unittest2.TestCase):
+    def client(self,handler):
+        httpx = transports.httpx
+        transport = transports.HTTP2Transport(transport=httpx.MockTransport(handler))
+        return Client(api_key,api_secret,transport=transport)
+
+    def test_requests_and_responses(self):
+        httpx = transports.httpx
+        seen = []
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200,json=mock_items)
+        client = self.client(handler)
+        self.assertEqual(client.get_orderbook('foo',limit=5,till=None),mock_items)
+        self.assertEqual(seen[0].method,'GET')
+        self.assertEqual(seen[0].url.path,'/api/2/public/orderbook/foo')
+        self.assertEqual(dict(seen[0].url.params),{'limit': '5'})
+        self.assertTrue(seen[0].headers['authorization'].startswith('Basic '))
+
+        client.create_order(symbol='ETHBTC',side='buy',quantity='1',price='0.5')
+        self.assertEqual(seen[1].method,'POST')
+        self.assertIn(b'symbol=ETHBTC',seen[1].content)
+
+    def test_errors_are_mapped(self):
+        httpx = transports.httpx
+        error_body = {'error': {'code': 20001,'message': 'Insufficient funds','description': ''}}
+        client = self.client(lambda request: httpx.Response(400,json=error_body))
+        with self.assertRaises(errors.InvalidRequestError):
+            client.get_trading_balance()
+
+        def refuse(request):
+            raise httpx.ConnectError('connection refused',request=request)
+        client = self.client(refuse)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.get_trading_balance()
+
+    def test_streamed_response(self):
+        httpx = transports.httpx
+        body = json.dumps([mock_items] * 100).encode('utf-8')
+        client = self.client(lambda request: httpx.Response(200,content=body))
+        response = client._get('public','trades','foo',stream=True)
+        self.assertEqual(b''.join(response.iter_content(64)),body)
@@ -19,3 +19,8 @@ class TestUtils(unittest2.TestCase):
         http_uri = 'http://foo.bar/baz'
         with self.assertWarns(UserWarning):
             utils.check_uri_security(http_uri)
+
+    def test_timestamp_round_trip(self):
+        self.assertEqual(utils.parse_timestamp('1970-01-01T00:01:00.500Z'),60.5)
+        self.assertEqual(utils.parse_timestamp('1970-01-01T00:01:00Z'),60)
+        self.assertEqual(utils.format_timestamp(60.5),'1970-01-01T00:01:00.500Z')
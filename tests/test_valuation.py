@@ -0,0 +1,79 @@
+# coding: utf-8
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import unittest2
+
+from hitbtcapi import valuation
+
+mock_symbols = [
+    {'id': 'BTCUSD','baseCurrency': 'BTC','quoteCurrency': 'USD'},
+    {'id': 'ETHBTC','baseCurrency': 'ETH','quoteCurrency': 'BTC'},
+    {'id': 'ETHUSD','baseCurrency': 'ETH','quoteCurrency': 'USD'},
+    {'id': 'XRPETH','baseCurrency': 'XRP','quoteCurrency': 'ETH'},
+    {'id': 'USDTUSD','baseCurrency': 'USDT','quoteCurrency': 'USD'},
+    {'id': 'DOGEBTC','baseCurrency': 'DOGE','quoteCurrency': 'BTC'},
+    {'id': 'FOOBAR','baseCurrency': 'FOO','quoteCurrency': 'BAR'},
+]
+
+mock_tickers = [
+    {'symbol': 'BTCUSD','bid': '10000','ask': '10010','last': '10005'},
+    {'symbol': 'ETHBTC','bid': '0.05','ask': '0.051','last': '0.05'},
+    {'symbol': 'ETHUSD','bid': '490','ask': '495','last': '492'},
+    {'symbol': 'XRPETH','bid': None,'ask': None,'last': '0.001'},
+    {'symbol': 'USDTUSD','bid': '0.99','ask': '1.01','last': '1'},
+    {'symbol': 'DOGEBTC','bid': None,'ask': None,'last': None},
+]
+
+
+@unittest2.skipIf(valuation.np is None,'numpy is not installed')
+class TestValuationEngine(unittest2.TestCase):
+    def setUp(self):
+        self.engine = valuation.ValuationEngine(mock_symbols,mock_tickers,quote_currency='USD')
+
+    def test_best_conversion_paths(self):
+        self.assertEqual(self.engine.price('USD'),1.0)
+        self.assertEqual(self.engine.price('BTC'),10000.0)
+        # selling ETH for BTC (500) beats selling ETH for USD directly (490)
+        self.assertAlmostEqual(self.engine.price('ETH'),500.0)
+        self.assertEqual(self.engine.path('ETH'),[('ETHBTC','sell'),('BTCUSD','sell')])
+        self.assertAlmostEqual(self.engine.price('XRP'),0.5)
+        self.assertEqual(len(self.engine.path('XRP')),3)
+        # no rates or no route to USD
+        self.assertEqual(self.engine.price('DOGE'),0.0)
+        self.assertEqual(self.engine.price('FOO'),0.0)
+
+    def test_buying_the_quote_currency_uses_the_ask(self):
+        engine = valuation.ValuationEngine(mock_symbols,mock_tickers,quote_currency='BTC')
+        self.assertAlmostEqual(engine.price('BTC'),1.0)
+        # buying ETH at 495 then selling it at 0.05 beats buying BTC at 10010
+        self.assertAlmostEqual(engine.price('USD'),0.05 / 495)
+        self.assertEqual(engine.path('USD'),[('ETHUSD','buy'),('ETHBTC','sell')])
+        engine.update_tickers([{'symbol': 'ETHUSD','bid': '490','ask': '550','last': '492'}])
+        engine.rebuild_paths()
+        self.assertAlmostEqual(engine.price('USD'),1 / 10010.0)
+        self.assertEqual(engine.path('USD'),[('BTCUSD','buy')])
+
+    def test_value_balances(self):
+        balances = [
+            {'currency': 'BTC','available': '1.5','reserved': '0.5'},
+            {'currency': 'ETH','available': '2','reserved': '0'},
+            {'currency': 'UNKNOWN','available': '100','reserved': '0'},
+        ]
+        self.assertAlmostEqual(self.engine.value(balances),21000.0)
+        values = self.engine.value_many([balances,[{'currency': 'USD','available': '5','reserved': '1'}],[]])
+        self.assertEqual(list(values),[21000.0,6.0,0.0])
+        self.assertEqual(len(self.engine.value_many([])),0)
+
+    def test_incremental_ticker_update(self):
+        self.engine.update_tickers([{'symbol': 'BTCUSD','bid': '20000','ask': '20010','last': '20000'}])
+        self.assertEqual(self.engine.price('BTC'),20000.0)
+        self.assertAlmostEqual(self.engine.price('ETH'),1000.0)
+        # ETH -> USD is now better directly, but paths only change on rebuild
+        self.engine.update_tickers([{'symbol': 'ETHUSD','bid': '1200','ask': '1210','last': '1200'}])
+        self.assertAlmostEqual(self.engine.price('ETH'),1000.0)
+        self.engine.rebuild_paths()
+        self.assertAlmostEqual(self.engine.price('ETH'),1200.0)
+        self.assertEqual(self.engine.path('ETH'),[('ETHUSD','sell')])